@@ -0,0 +1,68 @@
+# benchmarks/bench_clean_text.py
+# Compares the old multi-pass clean_and_prepare_text with summary_utils.text_cleaning.
+# Run from the repo root: python benchmarks/bench_clean_text.py [size_in_mb]
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from summary_utils.text_cleaning import clean_text, iter_clean_text, split_sentences
+
+
+def legacy_clean_and_prepare_text(raw_text):
+    """The previous implementation, kept here only as the benchmark baseline."""
+    temp_cleaned_text = re.sub(r'\s+', ' ', raw_text).strip()
+    temp_cleaned_text = re.sub(r'(\n\s*){2,}', '@@PARAGRAPH_BREAK@@', temp_cleaned_text)
+    temp_cleaned_text = temp_cleaned_text.replace('\n', ' ')
+    cleaned_text = temp_cleaned_text.replace('@@PARAGRAPH_BREAK@@', '\n\n')
+    cleaned_text = re.sub(r'(\bPage\s+\d+\s+of\s+\d+\b|\b\d+\s+of\s+\d+\b|\s+-\s*\d+\s*-\s*|\s+\d+\s+)', '', cleaned_text, flags=re.IGNORECASE)
+    cleaned_text = re.sub(r'https?://\S+|www\.\S+', '', cleaned_text)
+    cleaned_text = re.sub(r'\S+@\S+', '', cleaned_text)
+    cleaned_text = re.sub(r'©\s*\d{4}.*|Copyright\s*©?.*', '', cleaned_text, flags=re.IGNORECASE)
+    cleaned_text = re.sub(r'[^\w\s\.\,\;\:\?\!\-\'\(\)\"\`]', '', cleaned_text)
+    cleaned_text = re.sub(r'\s{2,}', ' ', cleaned_text).strip()
+    temp_sentences = re.split(r'(?<=[.!?])\s+', cleaned_text)
+    return cleaned_text, [s.strip() for s in temp_sentences if s.strip()]
+
+
+def make_document(size_bytes, seed=7):
+    rng = random.Random(seed)
+    words = ["summary", "reading", "model", "the", "of", "and", "analysis", "results", "data", "study"]
+    parts, size, page = [], 0, 1
+    while size < size_bytes:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(8, 20))).capitalize() + ". "
+        if rng.random() < 0.02:
+            sentence += "See https://example.com/page or mail info@example.com. "
+        if rng.random() < 0.05:
+            sentence += f"\n\nPage {page} of 500\n\n"
+            page += 1
+        parts.append(sentence)
+        size += len(sentence)
+    return "".join(parts)
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    doc = make_document(int(size_mb * 1024 * 1024))
+    pages = [doc[i:i + 3000] for i in range(0, len(doc), 3000)]
+
+    legacy = best_of(lambda: legacy_clean_and_prepare_text(doc))
+    single = best_of(lambda: split_sentences(clean_text(doc)))
+    streaming = best_of(lambda: split_sentences("".join(iter_clean_text(pages))))
+
+    print(f"input: {len(doc) / 1024 / 1024:.1f} MB")
+    print(f"legacy multi-pass : {legacy * 1000:8.1f} ms")
+    print(f"compiled cleaner  : {single * 1000:8.1f} ms  ({legacy / single:.2f}x)")
+    print(f"streaming (pages) : {streaming * 1000:8.1f} ms  ({legacy / streaming:.2f}x)")
@@ -1,19 +1,43 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx, add_script_run_ctx
 import requests
-from bs4 import BeautifulSoup
-from PyPDF2 import PdfReader
 import numpy as np
-import fitz
 from PIL import Image
 import io
-import re
+import os
 import math
 from transformers import AutoTokenizer # Requires 'transformers' library
 import time # Used for simulating delay if needed, or just for general time-based ops
 
 
 # ONLY ADDED: Import the common sidebar renderer from auth_utils
-from auth_utils.firebase_manager import render_sidebar_profile
+from auth_utils.firebase_manager import render_sidebar_profile, get_firestore_db
+from summary_utils.settings import get_setting
+from summary_utils.chunk_engine import map_in_order, batch_items
+from summary_utils.stages import run_stages_in_parallel
+from summary_utils.summary_cache import (
+    make_summary_key, SummaryCache, MemoryBackend, SQLiteBackend, FirestoreBackend
+)
+from summary_utils.response_cache import ResponseCache, memoize_payload, memoize_payloads
+from summary_utils.embedding_store import EmbeddingStore
+from summary_utils.embedding_backends import RemoteEmbeddingBackend, LocalBGEEmbeddingBackend
+from summary_utils.summarizer_backends import RemoteBartBackend, LocalBartBackend
+from summary_utils.chunker import TokenChunker
+from summary_utils.scoring import centroid_scores, top_k, mmr_select
+from summary_utils.pdf_extraction import iter_pdf_pages
+from summary_utils.ocr import needs_ocr, load_reader, ocr_pages
+from summary_utils.page_store import spill_to_disk
+from summary_utils.extracted_document import get_page_store, extracted_preview
+from summary_utils.text_cleaning import split_sentences
+from summary_utils.document_model import Document, as_document
+from summary_utils.http_client import HttpClient
+from summary_utils.rate_limiter import RateLimiter, session_scope
+from summary_utils.streaming import iter_chat_deltas, TokenStream
+from summary_utils.background import BackgroundJob, StageResults
+from summary_utils.async_client import AsyncModelClient, SyncFacade
+from summary_utils.web_extraction import extract_main_text, EXTRACTOR_VERSION
+from summary_utils.fetch_cache import FetchCache, fetch_text
+from summary_utils.url_batch import normalize_url, parse_url_list, iter_fetch_concurrently
 
 
 # --- Streamlit Configuration ---
@@ -51,6 +75,12 @@ KIMI_K2_CHAT_API_URL = "https://router.huggingface.co/v1/chat/completions"
 BART_SUMMARIZATION_API_URL = "https://router.huggingface.co/hf-inference/models/facebook/bart-large-cnn"
 BGE_EMBEDDING_API_URL = "https://router.huggingface.co/hf-inference/models/BAAI/bge-small-en-v1.5/pipeline/feature-extraction"
 
+KIMI_K2_MODEL_ID = "moonshotai/Kimi-K2-Instruct:novita"
+BART_MODEL_ID = "facebook/bart-large-cnn"
+BGE_MODEL_ID = "BAAI/bge-small-en-v1.5"
+# Bump whenever a prompt or generation parameter changes so cached summaries are not reused
+PROMPT_VERSION = "1"
+
 HEADERS_CHAT = {
     "Authorization": f"Bearer {HF_API_TOKEN}",
     "Content-Type": "application/json"
@@ -65,27 +95,288 @@ MODEL_MAX_TOKENS = 1024
 SAFETY_BUFFER = 50
 MAX_RECURSION_DEPTH = 3
 
+# --- Concurrency for the chunk (map) stage of the body summary ---
+CHUNK_CONCURRENCY = get_setting("chunk_concurrency", 4)
+# Extra attempts for a chunk whose call came back empty. The HTTP clients already retry connection
+# errors, 429 and 5xx with backoff, so remote calls default to none here to avoid stacking retries.
+CHUNK_MAX_RETRIES = get_setting("chunk_max_retries", 0)
+# Fraction of chunks that must summarize successfully before we reduce what we have
+MIN_CHUNK_SUCCESS_RATIO = get_setting("min_chunk_success_ratio", 0.5)
+
+# --- Summarization backend for the body: "remote" (HF router, default) or "local" (CPU torch) ---
+SUMMARIZATION_BACKEND = get_setting("summarization_backend", "remote")
+# e.g. "sshleifer/distilbart-cnn-12-6" for a faster local model with the same tokenizer
+LOCAL_BART_MODEL_ID = get_setting("local_bart_model_id", BART_MODEL_ID)
+LOCAL_BART_THREADS = get_setting("local_bart_threads", 4)
+LOCAL_BART_MAX_BATCH_SIZE = get_setting("local_bart_max_batch_size", 8)
+LOCAL_BART_MAX_WAIT_SECONDS = get_setting("local_bart_max_wait_seconds", 0.05)
+
+# --- PDF extraction: worker processes used for large documents ---
+PDF_EXTRACTION_WORKERS = get_setting("pdf_extraction_workers", min(4, os.cpu_count() or 1))
+
+# --- OCR fallback for pages without a text layer ---
+OCR_ENABLED = get_setting("ocr_enabled", True)
+OCR_DPI = get_setting("ocr_dpi", 200)
+OCR_LANGUAGES = get_setting("ocr_languages", "en")  # comma-separated easyocr language codes
+OCR_BATCH_SIZE = get_setting("ocr_batch_size", 4)
+OCR_WORKERS = get_setting("ocr_workers", 4)
+OCR_CACHE_PATH = get_setting("ocr_cache_path", ".ocr_cache.sqlite3")
+# Scanned pages OCR-ed together, and the most pages held back while waiting for OCR
+OCR_WINDOW_PAGES = get_setting("ocr_window_pages", 8)
+MAX_HELD_PAGES = get_setting("ocr_max_held_pages", 64)
+
+# --- Large-document mode: uploads above this size are spilled to disk and kept in the page store ---
+LARGE_DOCUMENT_BYTES = get_setting("large_document_bytes", 5 * 1024 * 1024)
+UPLOAD_SPOOL_DIR = get_setting("upload_spool_dir", ".uploads")
+# The page store itself (page_store_dir, preview_max_chars) is set up in summary_utils.extracted_document
+
+# --- Shared HTTP client: keep-alive pool, retries with jittered backoff, per-endpoint read timeouts ---
+HTTP_POOL_SIZE = get_setting("http_pool_size", 32)
+HTTP_MAX_RETRIES = get_setting("http_max_retries", 3)
+HTTP_TIMEOUTS = {
+    "chat": (5, get_setting("http_timeout_chat", 60.0)),
+    "summarization": (5, get_setting("http_timeout_summarization", 60.0)),
+    "embeddings": (5, get_setting("http_timeout_embeddings", 60.0)),
+    "fetch": (5, get_setting("http_timeout_fetch", 10.0)),
+}
+# --- Client-side rate limits for the Hugging Face router: (requests per second, burst) per endpoint ---
+# Requests queue per session and sessions are served round-robin; 0 disables the limit.
+RATE_LIMITS = {
+    "chat": (get_setting("rate_limit_chat_per_second", 1.0), get_setting("rate_limit_chat_burst", 4)),
+    "summarization": (get_setting("rate_limit_summarization_per_second", 4.0), get_setting("rate_limit_summarization_burst", 8)),
+    "embeddings": (get_setting("rate_limit_embeddings_per_second", 4.0), get_setting("rate_limit_embeddings_burst", 8)),
+}
+# A request that waits longer than this for its turn fails like any other failed call
+RATE_LIMIT_QUEUE_TIMEOUT = get_setting("rate_limit_queue_timeout_seconds", 120.0)
+# "sync" uses the pooled requests client; "async" multiplexes model calls on one asyncio loop
+HTTP_BACKEND = get_setting("http_backend", "sync")
+ASYNC_POOL_SIZE = get_setting("async_pool_size", 100)
+ASYNC_ENDPOINT_CONCURRENCY = {
+    "chat": get_setting("async_concurrency_chat", 8),
+    "summarization": get_setting("async_concurrency_summarization", 16),
+    "embeddings": get_setting("async_concurrency_embeddings", 16),
+}
+
+# --- Batch URL ingestion: concurrent fetches overall and per host ---
+URL_BATCH_WORKERS = get_setting("url_batch_workers", 8)
+URL_BATCH_PER_HOST = get_setting("url_batch_per_host", 2)
+URL_BATCH_MAX_URLS = get_setting("url_batch_max_urls", 50)
+
+# --- On-disk cache of fetched pages (revalidated with ETag / Last-Modified once older than the TTL) ---
+FETCH_CACHE_ENABLED = get_setting("fetch_cache_enabled", True)
+FETCH_CACHE_PATH = get_setting("fetch_cache_path", ".fetch_cache.sqlite3")
+FETCH_CACHE_MAX_BYTES = get_setting("fetch_cache_max_bytes", 256 * 1024 * 1024)
+FETCH_CACHE_TTL_SECONDS = get_setting("fetch_cache_ttl_seconds", 3600.0)
+
+# --- Stage orchestration for summarize_document ---
+PARALLEL_STAGES = get_setting("parallel_stages", True)
+# Shared wall-clock budget for all stages in parallel mode
+PIPELINE_DEADLINE_SECONDS = get_setting("pipeline_deadline_seconds", 240.0)
+# Stream the Kimi-K2 heading and Key Discoveries token by token into SummaReader (needs progressive_results)
+STREAM_CHAT = get_setting("stream_chat", True)
+# Run the pipeline in the background and fill SummaReader section by section as stages finish
+PROGRESSIVE_RESULTS = get_setting("progressive_results", True)
+
+# --- Summary cache (memory | sqlite | firestore | off) ---
+SUMMARY_CACHE_BACKEND = get_setting("summary_cache_backend", "sqlite")
+SUMMARY_CACHE_PATH = get_setting("summary_cache_path", ".summary_cache.sqlite3")
+SUMMARY_CACHE_MAX_ENTRIES = get_setting("summary_cache_max_entries", 2000)
+SUMMARY_CACHE_TTL_SECONDS = get_setting("summary_cache_ttl_seconds", 7 * 24 * 3600.0)
+
+# --- Per-call response cache for the model HTTP helpers ---
+RESPONSE_CACHE_ENABLED = get_setting("response_cache_enabled", True)
+RESPONSE_CACHE_MAX_BYTES = get_setting("response_cache_max_bytes", 64 * 1024 * 1024)
+# Empty string keeps the response cache in memory only
+RESPONSE_CACHE_PATH = get_setting("response_cache_path", ".response_cache.sqlite3")
+
+# --- Embedding backend for Main Points: "remote" (HF router) or "local" (in-process CPU model) ---
+EMBEDDING_BACKEND = get_setting("embedding_backend", "remote")
+LOCAL_EMBEDDING_THREADS = get_setting("local_embedding_threads", 4)
+LOCAL_EMBEDDING_BATCH_SIZE = get_setting("local_embedding_batch_size", 32)
+
+# --- Sentence embedding store (memory-mapped float32 matrix; empty string disables it) ---
+EMBEDDING_STORE_DIR = get_setting("embedding_store_dir", ".embedding_store")
+BGE_EMBEDDING_DIM = 384
+
+# --- Batching for BGE embedding requests (keeps payloads under the router's size limit) ---
+EMBEDDING_BATCH_SIZE = get_setting("embedding_batch_size", 64)
+EMBEDDING_BATCH_MAX_CHARS = get_setting("embedding_batch_max_chars", 20000)
+EMBEDDING_CONCURRENCY = get_setting("embedding_concurrency", 4)
+# Extra attempts for an embedding batch; none by default, the HTTP clients do the retrying
+EMBEDDING_MAX_RETRIES = get_setting("embedding_max_retries", 0)
+
+# --- Main Points selection: plain centroid ranking or MMR to avoid near-duplicate points ---
+MAIN_POINTS_MMR = get_setting("main_points_mmr", False)
+MAIN_POINTS_MMR_DIVERSITY = get_setting("main_points_mmr_diversity", 0.3)
+
 # --- Global Tokenizer for BART (now lazy-loaded, still cached) ---
 @st.cache_resource
 def load_bart_tokenizer_cached(): # Renamed for clarity in lazy loading
     try:
-        return AutoTokenizer.from_pretrained("facebook/bart-large-cnn")
+        return AutoTokenizer.from_pretrained(BART_MODEL_ID)
     except Exception as e:
         print(f"Error initializing BART tokenizer: {e}")
         return None
 
+@st.cache_resource
+def get_summary_cache():
+    """Process-wide summary cache shared by every session. Returns None when caching is off."""
+    backend_name = SUMMARY_CACHE_BACKEND.lower()
+    try:
+        if backend_name == "memory":
+            backend = MemoryBackend(SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_TTL_SECONDS)
+        elif backend_name == "sqlite":
+            backend = SQLiteBackend(SUMMARY_CACHE_PATH, SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_TTL_SECONDS)
+        elif backend_name == "firestore":
+            backend = FirestoreBackend(get_firestore_db(), ttl_seconds=SUMMARY_CACHE_TTL_SECONDS)
+        else:
+            return None
+    except Exception as e:
+        print(f"Error initializing summary cache ({backend_name}): {e}")
+        return None
+    return SummaryCache(backend)
+
+@st.cache_resource
+def get_response_cache():
+    """Process-wide byte-bounded cache for BART / BGE / Kimi-K2 responses. Returns None when disabled."""
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    return ResponseCache(RESPONSE_CACHE_MAX_BYTES, persist_path=RESPONSE_CACHE_PATH or None)
+
+@st.cache_resource
+def get_fetch_cache():
+    """Process-wide on-disk cache of fetched pages and their extracted text. Returns None when disabled."""
+    if not FETCH_CACHE_ENABLED:
+        return None
+    return FetchCache(FETCH_CACHE_PATH, FETCH_CACHE_MAX_BYTES, FETCH_CACHE_TTL_SECONDS)
+
+@st.cache_resource
+def get_embedding_store(backend_name: str):
+    """
+    Process-wide sentence embedding store for one backend ("remote" or "local"). Returns None when
+    disabled or the directory is unusable. Each backend gets its own sub-directory since remote and
+    local vectors are not guaranteed identical; pass the name of the backend actually in use.
+    """
+    if not EMBEDDING_STORE_DIR:
+        return None
+    try:
+        return EmbeddingStore(os.path.join(EMBEDDING_STORE_DIR, backend_name), dim=BGE_EMBEDDING_DIM)
+    except Exception as e:
+        print(f"Error initializing embedding store: {e}")
+        return None
+
+@st.cache_resource
+def load_local_embedding_backend():
+    """Loads bge-small-en-v1.5 for CPU inference once per process."""
+    try:
+        return LocalBGEEmbeddingBackend(
+            BGE_MODEL_ID,
+            num_threads=LOCAL_EMBEDDING_THREADS,
+            batch_size=LOCAL_EMBEDDING_BATCH_SIZE,
+        )
+    except Exception as e:
+        print(f"Error loading local embedding model: {e}")
+        return None
+
+def get_embedding_backend():
+    """Returns the configured embedding backend, falling back to the remote API if the local model fails to load."""
+    if EMBEDDING_BACKEND == "local":
+        backend = load_local_embedding_backend()
+        if backend is not None:
+            return backend
+    return RemoteEmbeddingBackend(_get_bge_embeddings)
+
+@st.cache_resource
+def load_local_bart_backend():
+    """Loads the local BART model and starts its dynamic batcher once per process."""
+    try:
+        return LocalBartBackend(
+            LOCAL_BART_MODEL_ID,
+            num_threads=LOCAL_BART_THREADS,
+            max_batch_size=LOCAL_BART_MAX_BATCH_SIZE,
+            max_wait=LOCAL_BART_MAX_WAIT_SECONDS,
+        )
+    except Exception as e:
+        print(f"Error loading local BART model: {e}")
+        return None
+
+def get_summarization_backend():
+    """Returns the configured body summarization backend, falling back to the remote API."""
+    if SUMMARIZATION_BACKEND == "local":
+        backend = load_local_bart_backend()
+        if backend is not None:
+            return backend
+    return RemoteBartBackend(
+        _query_bart_api,
+        max_workers=CHUNK_CONCURRENCY,
+        max_retries=CHUNK_MAX_RETRIES,
+        # the async client sends a whole recursion level at once on its event loop
+        query_many_fn=_query_bart_api_many if HTTP_BACKEND == "async" else None,
+    )
+
+@st.cache_resource
+def load_ocr_reader():
+    """Loads the easyocr reader (CPU) once per process."""
+    try:
+        return load_reader([lang.strip() for lang in OCR_LANGUAGES.split(",") if lang.strip()], gpu=False)
+    except Exception as e:
+        print(f"Error loading OCR reader: {e}")
+        return None
+
+@st.cache_resource
+def get_ocr_cache():
+    """Per-page OCR results keyed by page pixel hash, so re-uploaded scans skip recognition."""
+    if not OCR_CACHE_PATH:
+        return None
+    try:
+        return SQLiteBackend(OCR_CACHE_PATH, max_entries=20000, ttl_seconds=30 * 24 * 3600, table="ocr_cache")
+    except Exception as e:
+        print(f"Error initializing OCR cache: {e}")
+        return None
+
+@st.cache_resource
+def get_rate_limiter():
+    """Process-wide token buckets and fair queues for the model endpoints."""
+    return RateLimiter(RATE_LIMITS)
+
+@st.cache_resource
+def get_http_client():
+    """One pooled HTTP client per process, shared by every session and worker thread."""
+    return HttpClient(pool_size=HTTP_POOL_SIZE, max_retries=HTTP_MAX_RETRIES, timeouts=HTTP_TIMEOUTS,
+                      rate_limiter=get_rate_limiter(), queue_timeout=RATE_LIMIT_QUEUE_TIMEOUT)
+
+@st.cache_resource
+def get_async_client():
+    """One asyncio model client (and event loop thread) per process, behind a sync facade."""
+    client = AsyncModelClient(
+        {
+            "chat": (KIMI_K2_CHAT_API_URL, HEADERS_CHAT),
+            "summarization": (BART_SUMMARIZATION_API_URL, HEADERS_CHAT),
+            "embeddings": (BGE_EMBEDDING_API_URL, HEADERS_EMBEDDING),
+        },
+        concurrency=ASYNC_ENDPOINT_CONCURRENCY,
+        timeouts=HTTP_TIMEOUTS,
+        max_retries=HTTP_MAX_RETRIES,
+        pool_size=ASYNC_POOL_SIZE,
+        rate_limiter=get_rate_limiter(),
+        queue_timeout=RATE_LIMIT_QUEUE_TIMEOUT,
+    )
+    return SyncFacade(client)
+
 # The tokenizer is NOT loaded here anymore. It will be loaded when needed.
 # bart_tokenizer = load_bart_tokenizer() # REMOVED
 
 
-# --- Text Cleaning and Preparation Function (PRESERVED - NO CHANGES) ---
-def clean_and_prepare_text(raw_text: str) -> tuple[str, list[str]]:
+# --- Text Cleaning and Preparation Function ---
+def clean_and_prepare_text(raw_text) -> tuple[str, list[str]]:
     """
     Cleans raw text and prepares it for summarization by normalizing whitespace,
     removing common boilerplate, and tokenizing into sentences using rule-based regex.
+    Paragraph breaks are kept as a blank line.
 
     Args:
-        raw_text: The input text (e.g., from a 3-5 page write-up).
+        raw_text: The input text (e.g., from a 3-5 page write-up), or an iterable of page
+        strings, which is cleaned page by page without building the raw document first.
 
     Returns:
         A tuple containing:
@@ -93,62 +384,35 @@ def clean_and_prepare_text(raw_text: str) -> tuple[str, list[str]]:
         - original_sentences: A list of original sentences extracted from the cleaned text.
         These sentences retain their original phrasing for extractive tasks.
     """
-    if not isinstance(raw_text, str) or not raw_text.strip():
-        print("Warning: Input text is empty or not a string. Returning empty values.")
+    document = prepare_document(raw_text)
+    if document is None:
         return "", []
+    return document.text, document.sentences()
 
-    # --- Step 1: Initial Whitespace Normalization ---
-    temp_cleaned_text = re.sub(r'\s+', ' ', raw_text).strip()
-
-    # --- Step 2: Normalize Newlines for Paragraphs ---
-    temp_cleaned_text = re.sub(r'(\n\s*){2,}', '@@PARAGRAPH_BREAK@@', temp_cleaned_text)
-    temp_cleaned_text = temp_cleaned_text.replace('\n', ' ')
-    cleaned_text = temp_cleaned_text.replace('@@PARAGRAPH_BREAK@@', '\n\n')
-
-    # --- Step 3: Remove Common Boilerplate/Noise ---
-    cleaned_text = re.sub(r'(\bPage\s+\d+\s+of\s+\d+\b|\b\d+\s+of\s+\d+\b|\s+-\s*\d+\s*-\s*|\s+\d+\s+)', '', cleaned_text, flags=re.IGNORECASE)
-    cleaned_text = re.sub(r'https?://\S+|www\.\S+', '', cleaned_text)
-    cleaned_text = re.sub(r'\S+@\S+', '', cleaned_text)
-    cleaned_text = re.sub(r'©\s*\d{4}.*|Copyright\s*©?.*', '', cleaned_text, flags=re.IGNORECASE)
-    cleaned_text = re.sub(r'[^\w\s\.\,\;\:\?\!\-\'\(\)\"\`]', '', cleaned_text)
-
-    # --- Step 4: Final Whitespace Normalization ---
-    cleaned_text = re.sub(r'\s{2,}', ' ', cleaned_text).strip()
-
-    # --- Step 5: Rule-Based Sentence Tokenization (NO DOWNLOADS) ---
-    temp_sentences = re.split(r'(?<=[.!?])\s+', cleaned_text)
-    cleaned_sentences = []
-    for sentence in temp_sentences:
-        s = sentence.strip()
-        if s:
-            cleaned_sentences.append(s)
-
-    return cleaned_text, cleaned_sentences
+def prepare_document(raw_text):
+    """
+    Cleans raw text (a string or an iterable of page strings) into a Document holding the cleaned
+    text and its sentence/paragraph/page offsets. Built once per run and passed to every stage.
+    Returns None when there is no text.
+    """
+    if raw_text is None or (isinstance(raw_text, str) and not raw_text.strip()):
+        print("Warning: Input text is empty or not a string. Returning empty values.")
+        return None
+    return Document.from_raw(raw_text)
 
 
 # --- Helper Functions (for summarization - PRESERVED - NO CHANGES) ---
 def _split_into_sentences(text):
     """Splits a text into sentences using a simple regex-based approach."""
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    return [s.strip() for s in sentences if s.strip()]
-
-def _count_words(text):
-    """Counts the number of words in a given text."""
-    return len(text.split())
-
-def _cosine_similarity(vec1, vec2):
-    """Calculates the cosine similarity between two vectors."""
-    dot_product = sum(v1 * v2 for v1, v2 in zip(vec1, vec2))
-    magnitude1 = math.sqrt(sum(v**2 for v in vec1))
-    magnitude2 = math.sqrt(sum(v**2 for v in vec2))
-    if not magnitude1 or not magnitude2:
-        return 0.0
-    return dot_product / (magnitude1 * magnitude2)
+    return split_sentences(text)
 
+@memoize_payload("kimi-k2", get_response_cache)
 def _query_kimi_k2(payload):
     """Sends a request to the Kimi-K2-Instruct model via Hugging Face Router."""
+    if HTTP_BACKEND == "async":
+        return get_async_client().query("chat", payload)
     try:
-        response = requests.post(KIMI_K2_CHAT_API_URL, headers=HEADERS_CHAT, json=payload, timeout=60)
+        response = get_http_client().post(KIMI_K2_CHAT_API_URL, endpoint="chat", headers=HEADERS_CHAT, json=payload)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -156,10 +420,44 @@ def _query_kimi_k2(payload):
             print("Payload too large or bad request for Kimi-K2.")
         return None
 
+def _stream_kimi_k2(payload, stream):
+    """
+    Sends a streamed (SSE) chat request to Kimi-K2 and feeds each content delta into `stream`
+    (a TokenStream) as it arrives. Returns the full content, or None on failure.
+    """
+    try:
+        response = get_http_client().post(
+            KIMI_K2_CHAT_API_URL, endpoint="chat", headers=HEADERS_CHAT,
+            json={**payload, "stream": True}, stream=True
+        )
+        with response:
+            response.raise_for_status()
+            for delta in iter_chat_deltas(response):
+                stream.put(delta)
+        return stream.text
+    except requests.exceptions.RequestException as e:
+        if hasattr(e, 'response') and e.response is not None and e.response.status_code == 400:
+            print("Payload too large or bad request for Kimi-K2.")
+        return None
+    finally:
+        stream.close()
+
+def _complete_kimi_k2(payload, stream=None):
+    """Returns the Kimi-K2 completion text for `payload` (streamed into `stream` when given), or None."""
+    if stream is not None:
+        return _stream_kimi_k2(payload, stream)
+    response_data = _query_kimi_k2(payload)
+    if response_data:
+        return response_data["choices"][0]["message"]["content"]
+    return None
+
+@memoize_payload("bart", get_response_cache)
 def _query_bart_api(payload):
     """Robust API query for BART with error handling"""
+    if HTTP_BACKEND == "async":
+        return get_async_client().query("summarization", payload)
     try:
-        response = requests.post(BART_SUMMARIZATION_API_URL, headers=HEADERS_CHAT, json=payload, timeout=60)
+        response = get_http_client().post(BART_SUMMARIZATION_API_URL, endpoint="summarization", headers=HEADERS_CHAT, json=payload)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -167,22 +465,28 @@ def _query_bart_api(payload):
             print("Payload too large or bad request for BART.")
         return None
 
-def _get_bge_embeddings(sentences):
-    """Gets embeddings for a list of sentences using BAAI/bge-small-en-v1.5 model."""
-    payload = {
-        "inputs": sentences,
-        "parameters": {
-            "wait_for_model": True
-        }
-    }
+@memoize_payloads("bart", get_response_cache)
+def _query_bart_api_many(payloads):
+    """BART requests for many payloads at once on the async client. Results in input order, None for failures."""
+    return get_async_client().query_many("summarization", payloads)
+
+def _as_embeddings(response):
+    """The response if it is a list of vectors, else None."""
+    if isinstance(response, list) and all(isinstance(e, list) for e in response):
+        return response
+    return None
+
+@memoize_payload("bge", get_response_cache)
+def _query_bge_api(payload):
+    """Sends a feature-extraction request to BAAI/bge-small-en-v1.5. Returns the list of vectors or None."""
     try:
-        response = requests.post(BGE_EMBEDDING_API_URL, headers=HEADERS_EMBEDDING, json=payload, timeout=60)
-        response.raise_for_status()
-        embeddings = response.json()
-        if isinstance(embeddings, list) and all(isinstance(e, list) for e in embeddings):
-            return embeddings
+        if HTTP_BACKEND == "async":
+            embeddings = get_async_client().query("embeddings", payload)
         else:
-            return None
+            response = get_http_client().post(BGE_EMBEDDING_API_URL, endpoint="embeddings", headers=HEADERS_EMBEDDING, json=payload)
+            response.raise_for_status()
+            embeddings = response.json()
+        return _as_embeddings(embeddings)
     except requests.exceptions.RequestException as e:
         if hasattr(e, 'response') and e.response is not None and e.response.status_code == 400:
             print("Payload too large or bad request for BGE embeddings.")
@@ -190,8 +494,69 @@ def _get_bge_embeddings(sentences):
     except Exception as e:
         return None
 
-def _get_kimi_k2_abstractive_summary_for_outline(text, prompt_instruction, num_sentences_target):
-    """Generates an abstractive summary (Key Discoveries) using Kimi-K2-Instruct for the outline section."""
+@memoize_payloads("bge", get_response_cache)
+def _query_bge_api_many(payloads):
+    """BGE requests for many payloads at once on the async client. Results in input order, None for failures."""
+    return [_as_embeddings(response) for response in get_async_client().query_many("embeddings", payloads)]
+
+def _get_bge_embeddings(sentences, bypass_cache: bool = None):
+    """
+    Gets embeddings for a list of sentences using BAAI/bge-small-en-v1.5 model.
+    Sentences are sent in batches bounded by count and characters, concurrently, and the vectors are
+    joined back in input order. Returns None if any batch still fails after retries.
+    """
+    batches = batch_items(sentences, EMBEDDING_BATCH_SIZE, EMBEDDING_BATCH_MAX_CHARS)
+
+    def payload_for(batch):
+        return {
+            "inputs": batch,
+            "parameters": {
+                "wait_for_model": True
+            }
+        }
+
+    def checked(embeddings, batch):
+        if embeddings is None or len(embeddings) != len(batch):
+            return None
+        return embeddings
+
+    if HTTP_BACKEND == "async":
+        # every batch in flight at once on the async client's event loop
+        responses = _query_bge_api_many([payload_for(batch) for batch in batches], bypass_cache=bypass_cache)
+        results = [checked(embeddings, batch) for embeddings, batch in zip(responses, batches)]
+    else:
+        results = map_in_order(
+            lambda batch: checked(_query_bge_api(payload_for(batch), bypass_cache=bypass_cache), batch),
+            batches,
+            max_workers=EMBEDDING_CONCURRENCY,
+            max_retries=EMBEDDING_MAX_RETRIES,
+        )
+    if any(r is None for r in results):
+        failed = sum(r is None for r in results)
+        print(f"Failed to embed {failed}/{len(batches)} sentence batches.")
+        return None
+    return [vector for batch_result in results for vector in batch_result]
+
+def _embed_sentences(sentences):
+    """
+    Returns a float32 matrix of sentence embeddings, or None on failure.
+    Sentences already in the embedding store are never embedded again.
+    """
+    backend = get_embedding_backend()
+    # keyed on the backend in use: the local model may have fallen back to the remote API
+    store = get_embedding_store(backend.name)
+    if store is None:
+        return backend.embed(sentences)
+    if backend.name == "remote":
+        # the store already deduplicates, so skip the per-payload response cache
+        return store.get_or_compute(sentences, lambda missing: _get_bge_embeddings(missing, bypass_cache=True))
+    return store.get_or_compute(sentences, backend.embed)
+
+def _get_kimi_k2_abstractive_summary_for_outline(text, prompt_instruction, num_sentences_target, stream=None):
+    """
+    Generates an abstractive summary (Key Discoveries) using Kimi-K2-Instruct for the outline section.
+    With a TokenStream the completion is streamed into it as it is generated.
+    """
     user_prompt = f"{prompt_instruction}\n\nText: {text}"
     payload = {
         "messages": [
@@ -200,15 +565,15 @@ def _get_kimi_k2_abstractive_summary_for_outline(text, prompt_instruction, num_s
                 "content": user_prompt
             }
         ],
-        "model": "moonshotai/Kimi-K2-Instruct:novita",
+        "model": KIMI_K2_MODEL_ID,
         "temperature": 0.7,
         "max_tokens": num_sentences_target * 30,
         "stop": ["\n\n", "---", "###", "##", "#"]
     }
     try:
-        response_data = _query_kimi_k2(payload)
-        if response_data:
-            generated_content = response_data["choices"][0]["message"]["content"].strip()
+        generated_content = _complete_kimi_k2(payload, stream)
+        if generated_content:
+            generated_content = generated_content.strip()
             generated_sentences = _split_into_sentences(generated_content)
             filtered_sentences = [
                 s for s in generated_sentences
@@ -221,8 +586,8 @@ def _get_kimi_k2_abstractive_summary_for_outline(text, prompt_instruction, num_s
         return []
 
 # --- Main Summarization Functions (MODIFIED for lazy tokenizer loading) ---
-def generate_heading_summary(text_to_summarize):
-    """Generates a suitable heading for the given text using Kimi-K2-Instruct."""
+def generate_heading_summary(text_to_summarize, stream=None):
+    """Generates a suitable heading for the given text using Kimi-K2-Instruct (streamed into `stream` if given)."""
     user_prompt = (
         """In 2 - 10 word, what is the main topic of the following write up:"""
         f"{text_to_summarize}"
@@ -234,15 +599,15 @@ def generate_heading_summary(text_to_summarize):
                 "content": user_prompt
             }
         ],
-        "model": "moonshotai/Kimi-K2-Instruct:novita",
+        "model": KIMI_K2_MODEL_ID,
         "temperature": 0.7,
         "max_tokens": 20,
         "stop": ["\n", ".", "!", "?"]
     }
     try:
-        response_data = _query_kimi_k2(payload)
-        if response_data:
-            generated_content = response_data["choices"][0]["message"]["content"].strip()
+        generated_content = _complete_kimi_k2(payload, stream)
+        if generated_content:
+            generated_content = generated_content.strip()
             generated_content = generated_content.strip('.,!?;:"\' ')
             return generated_content
         else:
@@ -250,8 +615,17 @@ def generate_heading_summary(text_to_summarize):
     except Exception as e:
         return f"Error generating heading: {e}"
 
-def generate_body_summary(text: str, target_length: tuple = (150, 250), current_depth: int = 0):
-    """Recursively summarizes text with strict token limits using BART."""
+def generate_body_summary(text, target_length: tuple = (150, 250), current_depth: int = 0):
+    """
+    Recursively summarizes text with strict token limits using BART.
+    Chunks of one recursion level are summarized together by the configured backend
+    (concurrent API requests, or shared padded batches with the local model).
+    `text` may be a Document, whose sentence offsets are then reused for chunk boundaries.
+    """
+    sentence_starts = None
+    if isinstance(text, Document):
+        text, sentence_starts = text.text, text.sentence_starts
+
     # MODIFIED: Get tokenizer from the cached function, which will now be called inside the button block
     bart_tokenizer_instance = load_bart_tokenizer_cached() 
     if bart_tokenizer_instance is None:
@@ -259,88 +633,66 @@ def generate_body_summary(text: str, target_length: tuple = (150, 250), current_
 
     min_tokens = math.ceil(target_length[0] * 1.3)
     max_tokens = min(math.floor(target_length[1] * 1.3), MODEL_MAX_TOKENS - SAFETY_BUFFER)
-    encoded = bart_tokenizer_instance(text, return_tensors="pt", truncation=False) # Use instance
-    token_count = encoded['input_ids'].shape[1]
+    # One encode per recursion level: the offsets give both the token count and the chunk slices
+    chunker = TokenChunker(bart_tokenizer_instance)
+    encoded = chunker.encode(text)
+    token_count = encoded.token_count
 
     if token_count <= MODEL_MAX_TOKENS - SAFETY_BUFFER:
-        result = _query_bart_api({
-            "inputs": text,
-            "parameters": {
-                "max_length": max_tokens,
-                "min_length": min_tokens,
-                "do_sample": False
-            }
-        })
-        if result is None:
+        summary = get_summarization_backend().summarize_many([text], max_tokens, min_tokens)[0]
+        if summary is None:
             return "Failed to get a summary from the BART API."
-        return result[0]['summary_text'] if result and len(result) > 0 and 'summary_text' in result[0] else "Failed to get summary text from BART."
+        return summary
 
     if current_depth >= MAX_RECURSION_DEPTH:
         return "Max recursion depth reached for body summary."
 
-    chunk_size = 800
-    overlap = 100
-    tokens = bart_tokenizer_instance.encode(text, add_special_tokens=False) # Use instance
-    chunks = []
-    for i in range(0, len(tokens), chunk_size - overlap):
-        chunk = tokens[i:i + chunk_size]
-        chunks.append(bart_tokenizer_instance.decode(chunk)) # Use instance
-
-    intermediate = []
-    for chunk in chunks:
-        chunk_result = _query_bart_api({
-            "inputs": chunk,
-            "parameters": {
-                "max_length": 100,
-                "min_length": 20,
-                "do_sample": False
-            }
-        })
-        if chunk_result is None:
-            return "Failed to get an intermediate summary from the BART API during chunking."
+    chunks = [chunk_text for chunk_text, _ in chunker.chunk(encoded, chunk_size=800, overlap=100, boundaries=sentence_starts)]
 
-        if chunk_result and len(chunk_result) > 0 and 'summary_text' in chunk_result[0]:
-            intermediate.append(chunk_result[0]['summary_text'])
+    chunk_results = get_summarization_backend().summarize_many(chunks, 100, 20)
+    intermediate = [r for r in chunk_results if r]
 
     if not intermediate:
-        return "No intermediate summaries generated."
+        return "Failed to get an intermediate summary from the BART API during chunking."
+
+    failed = len(chunks) - len(intermediate)
+    if failed:
+        print(f"Warning: {failed}/{len(chunks)} chunks failed to summarize at depth {current_depth}.")
+        if len(intermediate) / len(chunks) < MIN_CHUNK_SUCCESS_RATIO:
+            return "Failed to get an intermediate summary from the BART API during chunking."
 
     return generate_body_summary(" ".join(intermediate), target_length, current_depth + 1)
 
-def generate_outline_summary(cleaned_text):
-    """Generates a structured outline summary based on the cleaned, unsummarized text."""
-    outline = {
-        "Main Points": [],
-        "Key Discoveries": []
-    }
-    word_count = _count_words(cleaned_text)
+def _outline_targets(document):
+    """Returns (num_main_points, num_key_discoveries) for a document based on its length."""
+    word_count = as_document(document).word_count
 
     if 400 <= word_count <= 1200:
-        num_main_points = 3
-        num_key_discoveries = 4
+        return 3, 4
     elif 1201 <= word_count <= 2000:
-        num_main_points = 5
-        num_key_discoveries = 5
+        return 5, 5
     else:
-        num_main_points = 5
-        num_key_discoveries = 5
+        return 5, 5
 
-    sentences = _split_into_sentences(cleaned_text)
+def generate_main_points(document, num_main_points):
+    """Extracts the sentences closest to the document centroid (BGE embeddings) as Main Points."""
+    sentences = as_document(document).sentences()
     if not sentences:
-        outline["Main Points"] = ["Error: No sentences found for main points."]
+        return ["Error: No sentences found for main points."]
+
+    embeddings = _embed_sentences(sentences)
+    if embeddings is None or not len(embeddings):
+        return ["Error: Failed to get embeddings for main points."]
+
+    scores, normalized = centroid_scores(embeddings)
+    if MAIN_POINTS_MMR:
+        ranked = mmr_select(normalized, scores, num_main_points, MAIN_POINTS_MMR_DIVERSITY)
     else:
-        embeddings = _get_bge_embeddings(sentences)
-        if embeddings is None or not embeddings:
-            outline["Main Points"] = ["Error: Failed to get embeddings for main points."]
-        else:
-            doc_centroid = [sum(col) / len(col) for col in zip(*embeddings)]
-            sentence_scores = []
-            for i, sentence_embedding in enumerate(embeddings):
-                score = _cosine_similarity(sentence_embedding, doc_centroid)
-                sentence_scores.append((score, sentences[i]))
-            sentence_scores.sort(key=lambda x: x[0], reverse=True)
-            outline["Main Points"] = [s[1] for s in sentence_scores[:num_main_points]]
+        ranked = top_k(scores, num_main_points)
+    return [sentences[i] for i in ranked]
 
+def generate_key_discoveries(document, num_key_discoveries, stream=None):
+    """Generates the Key Discoveries part of the outline with Kimi-K2-Instruct."""
     key_discoveries_prompt = (
             f"""Read the following text and generate {num_key_discoveries} interesting or important facts, insights, or discoveries, each between 11 to 15 words long.
             Each sentence should:
@@ -352,76 +704,328 @@ def generate_outline_summary(cleaned_text):
             Just provide the sentences directly.
             """
     )
-    outline["Key Discoveries"] = _get_kimi_k2_abstractive_summary_for_outline(
-        cleaned_text, key_discoveries_prompt, num_key_discoveries
+    return _get_kimi_k2_abstractive_summary_for_outline(
+        as_document(document).text, key_discoveries_prompt, num_key_discoveries, stream
     )
-    return outline
 
-def summarize_document(raw_text: str):
+def generate_outline_summary(cleaned_text, discoveries_stream=None):
+    """Generates a structured outline summary based on the cleaned, unsummarized text (or its Document)."""
+    document = as_document(cleaned_text)
+    num_main_points, num_key_discoveries = _outline_targets(document)
+    return {
+        "Main Points": generate_main_points(document, num_main_points),
+        "Key Discoveries": generate_key_discoveries(document, num_key_discoveries, discoveries_stream)
+    }
+
+def _summarize_sequentially(document, target_length=(150, 250), streams=None, on_stage_done=None):
+    """Runs every stage one after another. Returns (full_summary, stage_timings)."""
+    timings = {}
+    streams = streams or {}
+    on_stage_done = on_stage_done or (lambda name, value: None)
+
+    start = time.perf_counter()
+    heading = generate_heading_summary(document.text, streams.get("heading"))
+    timings["heading"] = time.perf_counter() - start
+    on_stage_done("heading", heading)
+
+    start = time.perf_counter()
+    body_summary = generate_body_summary(document, target_length)
+    timings["body"] = time.perf_counter() - start
+    on_stage_done("body", body_summary)
+
+    start = time.perf_counter()
+    outline_summary = generate_outline_summary(document, streams.get("key_discoveries"))
+    timings["outline"] = time.perf_counter() - start
+    on_stage_done("main_points", outline_summary["Main Points"])
+    on_stage_done("key_discoveries", outline_summary["Key Discoveries"])
+
+    return {
+        "Heading": heading,
+        "Body Summary": body_summary,
+        "Outline Summary": outline_summary
+    }, timings
+
+def _summarize_in_parallel(document, deadline, target_length=(150, 250), streams=None, on_stage_done=None):
+    """Starts heading, body, main points and key discoveries together under one shared deadline."""
+    num_main_points, num_key_discoveries = _outline_targets(document)
+    streams = streams or {}
+    results, timings = run_stages_in_parallel(
+        {
+            "heading": (generate_heading_summary, (document.text, streams.get("heading"))),
+            "body": (generate_body_summary, (document, target_length)),
+            "main_points": (generate_main_points, (document, num_main_points)),
+            "key_discoveries": (generate_key_discoveries, (document, num_key_discoveries, streams.get("key_discoveries"))),
+        },
+        fallbacks={
+            "heading": "Failed to generate heading.",
+            "body": "Failed to generate body summary.",
+            "main_points": ["Failed to generate main points."],
+            "key_discoveries": [],
+        },
+        deadline=deadline,
+        on_stage_done=on_stage_done,
+    )
+    return {
+        "Heading": results["heading"],
+        "Body Summary": results["body"],
+        "Outline Summary": {
+            "Main Points": results["main_points"],
+            "Key Discoveries": results["key_discoveries"]
+        }
+    }, timings
+
+def _is_cacheable(full_summary, timings):
+    """Only keep summaries where every stage finished and produced real output."""
+    if any(t is None for t in timings.values()):
+        return False
+    for text in (full_summary["Heading"], full_summary["Body Summary"]):
+        if text.startswith(("Failed", "Error", "Max recursion")):
+            return False
+    main_points = full_summary["Outline Summary"]["Main Points"]
+    if main_points and main_points[0].startswith(("Failed", "Error")):
+        return False
+    # an empty list is how Key Discoveries reports a failed or empty completion
+    return bool(full_summary["Outline Summary"]["Key Discoveries"])
+
+def _current_session_id():
+    """The Streamlit session running this script, used to share rate limits fairly between users."""
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "default"
+
+def summarize_document(raw_text, parallel: bool = None, target_length: tuple = (150, 250), use_cache: bool = True,
+                       session_id: str = None, streams: dict = None, on_stage_done=None):
     """
     Generates a full summary (Heading, Body, Outline) for a given document.
-    The raw_text is first cleaned using the comprehensive regex cleaning function.
+    The raw_text (a string or an iterable of page strings) is first cleaned using the
+    comprehensive regex cleaning function. With `parallel` (default from the `parallel_stages` setting) the independent stages run
+    concurrently under PIPELINE_DEADLINE_SECONDS; per-stage timings are returned under "Stage Timings".
+    Results are looked up in / stored to the summary cache, keyed by the cleaned text and parameters.
+    `streams` may map "heading" / "key_discoveries" to TokenStreams that receive those completions
+    as they are generated; they are not fed on a cache hit. `on_stage_done(name, result)` is called
+    as each stage ("heading", "body", "main_points", "key_discoveries") finishes.
     """
-    cleaned_text, _ = clean_and_prepare_text(raw_text)
-    if not cleaned_text.strip():
+    document = prepare_document(raw_text)
+    if document is None or not document.text.strip():
         return {"error": "Input text is empty or contains only whitespace after cleaning."}
 
-    heading = generate_heading_summary(cleaned_text)
-    body_summary = generate_body_summary(cleaned_text)
-    if not body_summary:
-        body_summary = "Failed to generate body summary."
+    cache = get_summary_cache() if use_cache else None
+    # the backends in use, which are remote when a local model failed to load
+    summarizer_name = get_summarization_backend().name
+    model_ids = (
+        KIMI_K2_MODEL_ID,
+        f"{summarizer_name}:{LOCAL_BART_MODEL_ID if summarizer_name == 'local' else BART_MODEL_ID}",
+        f"{get_embedding_backend().name}:{BGE_MODEL_ID}",
+    )
+    cache_key = make_summary_key(document.text, model_ids, target_length, PROMPT_VERSION)
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"Summary cache hit ({cache.stats()})")
+            return {**cached, "Stage Timings": {}, "Cached": True}
+
+    if parallel is None:
+        parallel = PARALLEL_STAGES
+
+    # every model call made for this run (including from worker threads) queues under this session
+    with session_scope(session_id or _current_session_id()):
+        if parallel:
+            full_summary, timings = _summarize_in_parallel(
+                document, PIPELINE_DEADLINE_SECONDS, target_length, streams, on_stage_done
+            )
+        else:
+            full_summary, timings = _summarize_sequentially(document, target_length, streams, on_stage_done)
 
-    outline_summary = generate_outline_summary(cleaned_text)
+    if not full_summary["Body Summary"]:
+        full_summary["Body Summary"] = "Failed to generate body summary."
 
-    full_summary = {
-        "Heading": heading,
-        "Body Summary": body_summary,
-        "Outline Summary": outline_summary
-    }
+    print("Summary stage timings (s): " + ", ".join(
+        f"{name}={t:.2f}" if t is not None else f"{name}=timeout/failed" for name, t in timings.items()
+    ))
+    print(f"Rate limiter queues: {get_rate_limiter().stats()}")
+    if cache is not None and _is_cacheable(full_summary, timings):
+        cache.set(cache_key, full_summary)
 
+    full_summary["Stage Timings"] = timings
     return full_summary
 
 
+def _run_summary_job(raw_text, streams, progress, session_id):
+    try:
+        return summarize_document(raw_text, session_id=session_id, streams=streams, on_stage_done=progress.set)
+    finally:
+        # stages that failed, timed out or hit the cache never close their stream themselves
+        for stream in streams.values():
+            stream.close()
+
+def _start_summary_job(raw_text):
+    """
+    Starts summarize_document on a background thread for this session.
+    Returns (streams, progress, job): token streams for the streamed sections, the per-stage
+    results published as stages finish, and the job holding the final summary.
+    """
+    streams = {"heading": TokenStream(), "key_discoveries": TokenStream()} if STREAM_CHAT else {}
+    progress = StageResults()
+    job = BackgroundJob(_run_summary_job, raw_text, streams, progress, _current_session_id())
+    add_script_run_ctx(job.thread)
+    return streams, progress, job.start()
+
+
 # --- Core Functions (for text extraction) ---
 def fetch_url_content(url):
     """Extract main text content from a URL"""
     try:
-        if not url.startswith(('http://', 'https://')) and not url.startswith('file://'):
-            url = 'https://' + url
+        url = normalize_url(url)
 
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
 
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        for element in soup(['script', 'style', 'nav', 'footer', 'iframe', 'noscript']):
-            element.decompose()
-
-        text = ' '.join([p.get_text(strip=True, separator=' ') for p in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'article'])])
+        text = fetch_text(
+            url,
+            lambda page_url, request_headers: get_http_client().get(page_url, endpoint="fetch", headers=request_headers),
+            extract_main_text,
+            EXTRACTOR_VERSION,
+            cache=get_fetch_cache(),
+            headers=headers,
+        )
         return text if text.strip() else "No main content found (may requires JavaScript rendering)"
     except Exception as e:
         return f"Error: {str(e)}"
 
+def _fetch_failed(content):
+    return content.startswith("Error") or content.startswith("No main content")
+
+def fetch_urls(urls):
+    """
+    Fetches and extracts many URLs concurrently (at most URL_BATCH_PER_HOST at a time per host).
+    Yields (index, url, content) as each page finishes; content is fetch_url_content's result.
+    """
+    for index, url, content in iter_fetch_concurrently(
+        [normalize_url(url) for url in urls], fetch_url_content, URL_BATCH_WORKERS, URL_BATCH_PER_HOST
+    ):
+        if isinstance(content, Exception):
+            content = f"Error: {content}"
+        yield index, url, content
+
 
 # PDF Parser
-def extract_pdf_text(pdf_file):
-    """Extract text from searchable PDFs"""
+def iter_pdf_text(source, progress_callback=None):
+    """
+    Yields the text of each PDF page in order, OCR-ing pages that have no text layer.
+    Text pages stream straight through; once a scanned page is seen, pages are held back until a
+    small window of scanned pages has been OCR-ed together, so memory stays bounded.
+    `progress_callback(pages_done)` is called after every extracted page.
+    """
+    ocr_reader = None
+    held, held_start, scanned = [], 0, []
+
+    def flush():
+        nonlocal ocr_reader
+        if scanned and OCR_ENABLED:
+            if ocr_reader is None:
+                ocr_reader = load_ocr_reader()
+            if ocr_reader is not None:
+                ocr_results = ocr_pages(
+                    source, scanned, ocr_reader,
+                    dpi=OCR_DPI,
+                    batch_size=OCR_BATCH_SIZE,
+                    max_workers=OCR_WORKERS,
+                    cache=get_ocr_cache(),
+                )
+                for i, page_text in ocr_results.items():
+                    held[i - held_start] = page_text
+                print(f"OCR recovered text for {len(ocr_results)}/{len(scanned)} scanned pages.")
+        pages = list(held)
+        held.clear()
+        scanned.clear()
+        return pages
+
+    for index, page_text in enumerate(iter_pdf_pages(source, max_workers=PDF_EXTRACTION_WORKERS)):
+        if progress_callback is not None:
+            progress_callback(index + 1)
+        if not held:
+            held_start = index
+        held.append(page_text)
+        if needs_ocr(page_text):
+            scanned.append(index)
+        if not scanned or len(scanned) >= OCR_WINDOW_PAGES or len(held) >= MAX_HELD_PAGES:
+            yield from flush()
+    yield from flush()
+
+def extract_pdf_text(pdf_file, progress_callback=None):
+    """
+    Extract text from searchable PDFs, with an OCR fallback for scanned pages.
+    Pages are streamed from PyMuPDF (PyPDF2 as fallback) and joined once at the end.
+    """
     try:
-        reader = PdfReader(pdf_file)
-        full_text = ""
-        for page in reader.pages:
-            full_text += page.extract_text() or ""
-        return full_text
+        data = pdf_file.getvalue() if hasattr(pdf_file, "getvalue") else pdf_file
+        return "\n".join(iter_pdf_text(data, progress_callback))
     except Exception as e:
         return f"Error reading PDF: {str(e)}"
 
+def extract_pdf_to_store(pdf_file, progress_callback=None):
+    """
+    Large-document path: spill the upload to disk, extract from the file (never fully in memory)
+    and write pages to the page store. Returns the document ID, or raises on failure.
+    """
+    path = spill_to_disk(pdf_file, UPLOAD_SPOOL_DIR, suffix=".pdf")
+    try:
+        with get_page_store().writer() as writer:
+            for page_text in iter_pdf_text(path, progress_callback):
+                writer.add_page(page_text)
+        return writer.doc_id
+    finally:
+        os.remove(path)
+
+
+# --- Extracted document in session state ---
+# Small documents live in st.session_state['extracted_text']; large PDFs live in the page store
+# and only their ID is kept in st.session_state['extracted_doc_id'].
+def _set_extracted_document(text: str = "", doc_id: str = None, source: str = None):
+    previous = st.session_state.get('extracted_doc_id')
+    if previous and previous != doc_id:
+        get_page_store().delete(previous)
+    st.session_state['extracted_text'] = text
+    st.session_state['extracted_doc_id'] = doc_id
+    st.session_state['extracted_source'] = source
+
+def _get_extracted_text():
+    """The extracted document: a string, or a page iterator for documents in the page store."""
+    doc_id = st.session_state.get('extracted_doc_id')
+    if doc_id and get_page_store().exists(doc_id):
+        return (page + "\n" for page in get_page_store().iter_pages(doc_id))
+    return st.session_state.get('extracted_text', "")
+
+def _extracted_word_count() -> int:
+    doc_id = st.session_state.get('extracted_doc_id')
+    if doc_id and get_page_store().exists(doc_id):
+        return get_page_store().word_count(doc_id)
+    return len(st.session_state.get('extracted_text', "").split())
+
 
 
 # --- Main Page UI and Logic ---
+def _fetch_reading_list(urls):
+    """Fetches a list of URLs concurrently, reporting each one as it finishes, and uses the successful pages."""
+    contents = [None] * len(urls)
+    progress = st.progress(0.0, text=f"Fetched 0/{len(urls)} pages")
+    for finished, (index, url, content) in enumerate(fetch_urls(urls), start=1):
+        progress.progress(finished / len(urls), text=f"Fetched {finished}/{len(urls)} pages")
+        if _fetch_failed(content):
+            st.error(f"{url}: {content}")
+        else:
+            contents[index] = content
+            st.write(f"✅ {url} ({len(content.split())} words)")
+
+    pages = [content for content in contents if content]
+    if not pages:
+        _set_extracted_document("")
+        return
+    # keep the reading-list order, one paragraph break between pages
+    _set_extracted_document("\n\n".join(pages), source='url')
+    st.text_area(label= 'Web Content', value= extracted_preview(), height= 300, key="url_list_content_display")
+    st.toast(f'Ready to generate full summary from {len(pages)} pages')
+
 def main():
     
     st.write("<h3 style='text-align:center; font-size: 32px; font-weight: bold;'>📝 Text Extraction</h3>", unsafe_allow_html=True)
@@ -431,6 +1035,8 @@ def main():
     # Initialize session state variables (preserved - NO CHANGES)
     if 'extracted_text' not in st.session_state:
         st.session_state['extracted_text'] = ""
+    if 'extracted_doc_id' not in st.session_state:
+        st.session_state['extracted_doc_id'] = None
     if 'summary_output' not in st.session_state:
         st.session_state['summary_output'] = None
         
@@ -444,7 +1050,7 @@ def main():
             height=300,
             key='text_area_key')
         if st.button('Use text'):
-            st.session_state['extracted_text'] = text
+            _set_extracted_document(text, source='text')
             st.toast('Ready to generate summary')
 
     with tab_url:
@@ -453,37 +1059,63 @@ def main():
             if url_input:
                 with st.spinner("Fetching content..."):
                     fetched_content = fetch_url_content(url_input)
-                if "Error" in fetched_content or "No main content" in fetched_content:
+                if _fetch_failed(fetched_content):
                     st.error(fetched_content)
-                    st.session_state['extracted_text'] = ""
+                    _set_extracted_document("")
                 else:
-                    st.session_state['extracted_text'] = fetched_content
+                    _set_extracted_document(fetched_content, source='url')
                     # Display the fetched content in a text_area within this tab
-                    st.text_area(label= 'Web Content', value= fetched_content, height= 300, key="url_content_display")
+                    st.text_area(label= 'Web Content', value= extracted_preview(), height= 300, key="url_content_display")
                     st.toast('Ready to generate full summary')
             else:
                 st.warning("Please enter a URL.")
 
+        with st.expander("Fetch a reading list"):
+            url_list_input = st.text_area("One URL per line", placeholder= 'paste your links here...', height= 150)
+            if st.button("Fetch all URLs"):
+                urls = parse_url_list(url_list_input)[:URL_BATCH_MAX_URLS]
+                if urls:
+                    _fetch_reading_list(urls)
+                else:
+                    st.warning("Please enter at least one URL.")
+
 
     with tab_pdf:
         pdf_file = st.file_uploader("Upload a PDF file:", type=["pdf"])
         if pdf_file:
             # if st.button("Extract from PDF"): # Removed the button for PDF as it triggers automatically on upload now
-            with st.spinner("Extracting text from PDF..."):
-                pdf_content = extract_pdf_text(pdf_file)
-            if not pdf_content.strip():
+            # Streamlit reruns the script on every interaction; only extract each upload once
+            upload_key = getattr(pdf_file, "file_id", None) or f"{pdf_file.name}:{pdf_file.size}"
+            if st.session_state.get('pdf_upload_key') != upload_key:
+                with st.spinner("Extracting text from PDF..."):
+                    progress = st.empty()
+                    on_page = lambda pages_done: progress.caption(f"Extracted {pages_done} pages...")
+                    if pdf_file.size >= LARGE_DOCUMENT_BYTES:
+                        try:
+                            _set_extracted_document("", extract_pdf_to_store(pdf_file, on_page), source='pdf')
+                        except Exception as e:
+                            st.error(f"Error reading PDF: {str(e)}")
+                            _set_extracted_document("", source='pdf')
+                    else:
+                        pdf_content = extract_pdf_text(pdf_file, on_page)
+                        _set_extracted_document(pdf_content if pdf_content.strip() else "", source='pdf')
+                    progress.empty()
+                st.session_state['pdf_upload_key'] = upload_key
+                if _extracted_word_count():
+                    st.toast('Ready to generate summary')
+
+            if st.session_state.get('extracted_source') != 'pdf':
+                pass  # text from another tab was chosen after this upload
+            elif not _extracted_word_count():
                 st.error("Failed to extract any text from the PDF.")
-                st.session_state['extracted_text'] = ""
             else:
-                st.session_state['extracted_text'] = pdf_content
-                # Display the extracted PDF content in a text_area within this tab
-                st.text_area(label= 'PDF Content', value= pdf_content, height= 300, key="pdf_content_display")
-                st.toast('Ready to generate summary')
+                # Display a preview of the extracted PDF content in a text_area within this tab
+                st.text_area(label= 'PDF Content', value= extracted_preview(), height= 300, key="pdf_content_display")
 
     # --- Summarization Logic (MODIFIED for lazy tokenizer loading) ---
     if st.button("📋 Generate Your Summary", key="generate_summary_button", width= "stretch"):
-        if st.session_state['extracted_text'] and st.session_state['extracted_text'].strip():
-            length = len(st.session_state['extracted_text'].split())
+        length = _extracted_word_count()
+        if length:
             if length < 400:
                 st.toast(f'{length}/400 words; Writing too short!')
             else:
@@ -494,8 +1126,14 @@ def main():
                         st.session_state['bart_tokenizer_instance'] = load_bart_tokenizer_cached()
                     bart_tokenizer = st.session_state['bart_tokenizer_instance'] # Assign to global for function use
 
-                    summary_output = summarize_document(st.session_state['extracted_text'])
-                    st.session_state['summary_output'] = summary_output
+                    if PROGRESSIVE_RESULTS:
+                        # SummaReader fills in each section (streaming the Kimi-K2 ones) as its stage finishes
+                        st.session_state['summary_output'] = None
+                        (st.session_state['summary_streams'], st.session_state['summary_progress'],
+                         st.session_state['summary_job']) = _start_summary_job(_get_extracted_text())
+                    else:
+                        summary_output = summarize_document(_get_extracted_text())
+                        st.session_state['summary_output'] = summary_output
                 st.success("Summary generated successfully!")
                 st.switch_page("pages/3_SummaReader.py")
         else:
@@ -505,7 +1143,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
-
-
-
@@ -1,11 +1,10 @@
 import streamlit as st
-import base64
-from io import BytesIO
-from gtts import gTTS
 import time
 
 # ONLY ADDED: Import the common sidebar renderer from auth_utils
 from auth_utils.firebase_manager import render_sidebar_profile
+from summary_utils.settings import get_setting
+from summary_utils.tts import get_engine, AudioCache, SpeechSynthesizer, audio_duration, AUDIO_MIME_TYPES
 
 
 st.set_page_config(
@@ -67,19 +66,155 @@ st.markdown('''
     box-shadow: 0 -2px 10px rgba(0, 0, 0, 0);
     z-index: 1000;
 }
+/* The Read Aloud player (st.audio) sits in the fixed footer */
+audio[data-testid="stAudio"] {
+    position: fixed;
+    bottom: 40px;
+    left: 15px;
+    width: calc(100% - 30px);
+    z-index: 1000;
+}
 </style>
 ''', unsafe_allow_html= True)
 
 
+# How often the in-progress view checks for new tokens and finished stages
+PROGRESS_POLL_SECONDS = 0.1
+
+# --- Read Aloud: "gtts" (network, MP3), "pyttsx3" (offline, WAV) or "tone" (test tones, WAV); segments synthesize in parallel ---
+TTS_ENGINE = get_setting("tts_engine", "gtts")
+TTS_WORKERS = get_setting("tts_workers", 4)
+TTS_SEGMENT_CHARS = get_setting("tts_segment_chars", 500)
+TTS_FIRST_SEGMENT_CHARS = get_setting("tts_first_segment_chars", 150)
+TTS_CACHE_MAX_BYTES = get_setting("tts_cache_max_bytes", 64 * 1024 * 1024)
+
+
+@st.cache_resource
+def get_speech_synthesizer():
+    """One synthesizer (and audio cache) per process, shared by every session."""
+    return SpeechSynthesizer(
+        get_engine(TTS_ENGINE),
+        AudioCache(TTS_CACHE_MAX_BYTES),
+        max_workers=TTS_WORKERS,
+        segment_chars=TTS_SEGMENT_CHARS,
+        first_segment_chars=TTS_FIRST_SEGMENT_CHARS,
+    )
+
+
+def _play(placeholder, audio_bytes, audio_format, autoplay=True, start_time=0):
+    # st.audio hands the bytes to Streamlit's media file manager (deduplicated by content hash)
+    # and only sends the browser a URL, instead of a base64 data URI on every rerun
+    placeholder.audio(
+        audio_bytes,
+        format=AUDIO_MIME_TYPES.get(audio_format, "audio/mpeg"),
+        autoplay=autoplay,
+        start_time=start_time,
+    )
+
+
+def _finish_summary_job():
+    """Moves a finished background summary (started on the Extract page) into summary_output."""
+    job = st.session_state.get('summary_job')
+    if job is None or not job.done:
+        return
+    st.session_state['summary_output'] = job.result if job.error is None else None
+    if job.error is not None:
+        st.error(f"Error generating summary: {job.error}")
+    for key in ('summary_job', 'summary_streams', 'summary_progress'):
+        st.session_state.pop(key, None)
+
+
+def _bullets(items):
+    return "".join(f"<ul class='outline-summary'><li>{item}</li></ul>" for item in items)
+
+
+def _pending(label):
+    return f"<p class='body-summary' style='opacity: 0.5;'>{label}...</p>"
+
+
+def _render_progress(job, progress, streams):
+    """
+    Shows each section in its own placeholder while the pipeline runs: finished stages are drawn
+    as soon as they complete, streamed sections show the tokens received so far, and the rest
+    keep a pending note. Returns once the whole job is done.
+    """
+    placeholders = {}
+    placeholders['heading'] = st.empty()
+    st.write('---')
+    placeholders['body'] = st.empty()
+    st.write('---')
+    st.markdown('<h4 class= "points">Important Points:</h4>', unsafe_allow_html= True)
+    placeholders['main_points'] = st.empty()
+    placeholders['key_discoveries'] = st.empty()
+
+    rendered = {}
+    while True:
+        finished = job.done
+        streamed = {name: stream.text for name, stream in streams.items()}
+        sections = {}
+
+        if 'heading' in progress:
+            sections['heading'] = f"<h2 class='heading-summary'>{progress.get('heading')}</h2>"
+        else:
+            sections['heading'] = f"<h2 class='heading-summary'>{streamed.get('heading') or '...'}</h2>"
+
+        if 'body' in progress:
+            sections['body'] = f"<p class='body-summary'>{progress.get('body')}</p>"
+        else:
+            sections['body'] = _pending("Summarizing the body")
+
+        if 'main_points' in progress:
+            sections['main_points'] = _bullets(progress.get('main_points'))
+        else:
+            sections['main_points'] = _pending("Picking the main points")
+
+        if 'key_discoveries' in progress:
+            sections['key_discoveries'] = _bullets(progress.get('key_discoveries'))
+        elif streamed.get('key_discoveries'):
+            sections['key_discoveries'] = f"<p class='outline-summary'>{streamed['key_discoveries']}</p>"
+        else:
+            sections['key_discoveries'] = _pending("Finding key discoveries")
+
+        for name, html in sections.items():
+            if rendered.get(name) != html:
+                placeholders[name].markdown(html, unsafe_allow_html=True)
+                rendered[name] = html
+        if finished:
+            return
+        time.sleep(PROGRESS_POLL_SECONDS)
+
+
 # Main content container
 main_container = st.container()
 footer_container = st.container()
+# The footer player; Read Aloud plays the first segment here while the rest is synthesized,
+# then swaps in the whole track
+with footer_container:
+    st.markdown(
+        """
+        <div class="fixed-footer">
+            <h4></h4>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    audio_placeholder = st.empty()
 
+_finish_summary_job()
 
 with main_container:
 
+    if 'summary_job' in st.session_state:
+        # The summary is still being generated: fill in each section as its stage finishes
+        _render_progress(
+            st.session_state['summary_job'],
+            st.session_state['summary_progress'],
+            st.session_state['summary_streams'],
+        )
+        st.rerun()
+
     # Check if the summary exists in session state (PRESERVED - NO CHANGES)
-    if 'summary_output' in st.session_state and st.session_state['summary_output'] is not None:
+    elif 'summary_output' in st.session_state and st.session_state['summary_output'] is not None:
         summary = st.session_state['summary_output']
 
         # Display the heading with the biggest font-size and center alignment
@@ -120,15 +255,15 @@ with main_container:
         )
 
         # Download Full Summary
-        if st.button("Download Summary", width= "stretch", icon= ":material/download:"):
-            st.download_button(
-                label= "Download Now",
-                data= full_summary_text_for_tts,
-                file_name= "SummaRead_Summary.docx",
-                on_click= "ignore",
-                type= "primary",
-                icon= ":material/download:",
-            )
+        st.download_button(
+            label= "Download Summary",
+            data= full_summary_text_for_tts,
+            mime= "text/plain",
+            file_name= "SummaRead_Summary.docx",
+            on_click= "ignore",
+            width= "stretch",
+            icon= ":material/download:",
+        )
 
         # Accent selection (PRESERVED - NO CHANGES)
         accent_options = {
@@ -142,16 +277,33 @@ with main_container:
         )
         tld = accent_options[accent]
 
-        # Button to generate speech - now directly uses full_summary_text_for_tts (PRESERVED - NO CHANGES)
+        # Button to generate speech: sentence segments are synthesized in parallel and cached
         if st.button("🔊 Read Aloud!"):
             if full_summary_text_for_tts.strip():
                 try:
+                    synthesizer = get_speech_synthesizer()
+
+                    preview = {}
+
+                    def _play_first_segment(audio):
+                        preview["started"] = time.monotonic()
+                        preview["duration"] = audio_duration(audio, synthesizer.audio_format)
+                        _play(audio_placeholder, audio, synthesizer.audio_format)
+
                     with st.spinner("Generating audio..."):
-                        # Pass the full_summary_text_for_tts directly to gTTS
-                        tts = gTTS(text=full_summary_text_for_tts, lang='en', tld=tld)
-                        audio_bytes = BytesIO()
-                        tts.write_to_fp(audio_bytes)
-                        st.session_state.audio_data = audio_bytes.getvalue()
+                        st.session_state.audio_data = synthesizer.synthesize(
+                            full_summary_text_for_tts, tld, on_first_segment=_play_first_segment
+                        )
+                        st.session_state.audio_format = synthesizer.audio_format
+                    # the footer swaps the first-segment preview for the whole track, carrying on from
+                    # about where the preview has got to (at most its end) instead of starting over
+                    position = 0
+                    if preview:
+                        position = time.monotonic() - preview["started"]
+                        if preview["duration"] is not None:
+                            position = min(position, preview["duration"])
+                    # kept for later reruns too: a changed start_time would make the player seek back
+                    st.session_state.audio_start_time = int(position)
                     st.success("Done!")
                 except Exception as e:
                     st.error(f"Error generating speech: {e}")
@@ -164,26 +316,11 @@ with main_container:
         if st.button('Go to Text Extraction', icon="📝", use_container_width= True):
             st.switch_page("pages/2_Extract.py")
 
-# Fixed footer in the second container (PRESERVED - NO CHANGES)
-with footer_container:
-    st.markdown(
-        """
-        <div class="fixed-footer">
-            <h4></h4>
-        </div>
-        """,
-        unsafe_allow_html=True
+# Fixed footer in the second container, rendered with the same props on every rerun for a track
+if 'audio_data' in st.session_state:
+    _play(
+        audio_placeholder,
+        st.session_state.audio_data,
+        st.session_state.get('audio_format', 'mp3'),
+        start_time=st.session_state.get('audio_start_time', 0),
     )
-    
-    if 'audio_data' in st.session_state:
-        audio_base64 = base64.b64encode(st.session_state.audio_data).decode('utf-8')
-        st.markdown(
-            f"""
-            <div class="fixed-footer">
-                <audio controls autoplay style="width:100%">
-                    <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-                </audio>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
\ No newline at end of file
@@ -2,6 +2,7 @@ import streamlit as st
 
 # ONLY ADDED: Import the common sidebar renderer from auth_utils
 from auth_utils.firebase_manager import render_sidebar_profile
+from summary_utils.extracted_document import extracted_preview
 
 # --- Streamlit Configuration ---
 st.set_page_config(
@@ -35,12 +36,15 @@ st.write("<h3 style='text-align:center; font-size: 32px; font-weight: bold;'>⚖
 
 st.write('---')
 
+# Large PDFs are kept in the page store by the Extract page; only a preview is shown here
+original_text = extracted_preview()
+
 # Comparison UI (PRESERVED - NO CHANGES)
 col1, col2 = st.columns(2)
 
 with col1:
     st.text_area(label= 'Original Text',
-                    value= st.session_state.get('extracted_text', 'No original text available. Please extract text first.'),
+                    value= original_text or 'No original text available. Please extract text first.',
                 height= 500)
 
 with col2:
@@ -64,15 +68,15 @@ with col2:
                 height= 500)
 
     # Download Full Summary
-    if st.button("Download Summary", width= "stretch", icon= ":material/download:"):
-        st.download_button(
-            label= "Download Now",
-            data= display_summary_text,
-            file_name= "SummaRead_Summary.docx",
-            on_click= "ignore",
-            type= "primary",
-            icon= ":material/download:",
-        )    
+    st.download_button(
+        label= "Download Summary",
+        data= display_summary_text,
+        mime= "text/plain",
+        file_name= "SummaRead_Summary.docx",
+        on_click= "ignore",
+        width= "stretch",
+        icon= ":material/download:",
+    )
 
 
 
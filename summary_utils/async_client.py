@@ -0,0 +1,151 @@
+# summary_utils/async_client.py
+import time
+import random
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+from summary_utils.http_client import RETRY_STATUS_CODES
+from summary_utils.rate_limiter import current_session
+
+logger = logging.getLogger(__name__)
+
+
+def _retry_after_seconds(headers, body):
+    """Retry-After header (seconds or HTTP date) or the router's `estimated_time`; None if neither."""
+    header = headers.get("Retry-After")
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    if isinstance(body, dict) and body.get("estimated_time") is not None:
+        try:
+            return max(0.0, float(body["estimated_time"]))
+        except (TypeError, ValueError):
+            pass
+    return None
+
+
+class AsyncModelClient:
+    """
+    asyncio client for the Kimi-K2, BART and BGE endpoints.
+
+    All calls share one aiohttp connection pool; a semaphore per endpoint caps in-flight requests
+    to each model, so one process can keep many requests open across sessions without a thread
+    per request. Responses follow the sync helpers' contract: parsed JSON, or None on failure.
+    An optional RateLimiter is consulted before every attempt, ahead of the endpoint semaphore, so
+    its per-session round-robin sees every queued request; the wait happens on the event loop.
+    """
+
+    def __init__(self, endpoints: dict, concurrency: dict = None, timeouts: dict = None,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 20.0,
+                 pool_size: int = 100, rate_limiter=None, queue_timeout: float = None):
+        # endpoints: name -> (url, headers), e.g. {"chat": (KIMI_K2_CHAT_API_URL, HEADERS_CHAT), ...}
+        self.endpoints = endpoints
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter
+        self.queue_timeout = queue_timeout
+        self._concurrency = concurrency or {}
+        self._timeouts = timeouts or {}
+        self._session = None
+        self._semaphores = {}
+
+    async def _get_session(self):
+        # created lazily so it binds to the loop that runs the calls
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphores = {
+                name: asyncio.Semaphore(self._concurrency.get(name, 16)) for name in self.endpoints
+            }
+        return self._session
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _admit(self, endpoint: str, session_id: str) -> bool:
+        if self.rate_limiter is None:
+            return True
+        return await self.rate_limiter.acquire_async(endpoint, session_id, self.queue_timeout)
+
+    async def query(self, endpoint: str, payload, session_id: str = None):
+        """POST `payload` as JSON to the named endpoint with retries. Returns parsed JSON or None."""
+        session = await self._get_session()
+        url, headers = self.endpoints[endpoint]
+        connect, read = self._timeouts.get(endpoint, (5, 60))
+        timeout = aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+        for attempt in range(self.max_retries + 1):
+            # fair admission first: requests queue per session there, not FIFO on the semaphore
+            if not await self._admit(endpoint, session_id):
+                logger.warning("No %s rate-limit token within %ss.", endpoint, self.queue_timeout)
+                return None
+            try:
+                async with self._semaphores[endpoint]:
+                    async with session.post(url, headers=headers, json=payload, timeout=timeout) as response:
+                        try:
+                            body = await response.json(content_type=None)
+                        except ValueError:
+                            body = None
+                        if response.status < 400:
+                            return body
+                        if response.status not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                            if response.status == 400:
+                                logger.warning("Payload too large or bad request for %s.", endpoint)
+                            return None
+                        requested = _retry_after_seconds(response.headers, body)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.max_retries:
+                    logger.error("%s request failed: %s", endpoint, e)
+                    return None
+                requested = None
+
+            # back off without holding a concurrency slot
+            delay = min(self.backoff_max, requested) if requested is not None else self._backoff(attempt)
+            await asyncio.sleep(delay)
+        return None
+
+    async def query_many(self, endpoint: str, payloads, session_id: str = None):
+        """Send every payload at once (bounded by the endpoint semaphore); results in input order."""
+        return await asyncio.gather(*(self.query(endpoint, payload, session_id) for payload in payloads))
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
+class SyncFacade:
+    """
+    Runs an AsyncModelClient on a private event loop thread so synchronous Streamlit code
+    (summarize_document and its helpers) can call it. Every session shares the same loop and pool.
+    """
+
+    def __init__(self, client: AsyncModelClient):
+        self.client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="model-client-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine, timeout: float = None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    # The loop thread has its own context, so the caller's session is passed along explicitly.
+    def query(self, endpoint: str, payload):
+        return self.run(self.client.query(endpoint, payload, current_session()))
+
+    def query_many(self, endpoint: str, payloads):
+        return self.run(self.client.query_many(endpoint, list(payloads), current_session()))
+
+    def close(self):
+        self.run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
@@ -0,0 +1,65 @@
+# summary_utils/background.py
+import logging
+import threading
+import contextvars
+
+logger = logging.getLogger(__name__)
+
+
+class StageResults:
+    """
+    Results of a running pipeline, published stage by stage so a page can show each section as
+    soon as it is ready. The first value recorded for a stage wins (late stragglers are ignored).
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def set(self, name: str, value):
+        with self._lock:
+            self._results.setdefault(name, value)
+
+    def get(self, name: str, default=None):
+        with self._lock:
+            return self._results.get(name, default)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._results
+
+
+class BackgroundJob:
+    """
+    Runs `target(*args, **kwargs)` on a daemon thread (in a copy of the caller's context) and keeps
+    the outcome for later reruns to pick up. Kept in st.session_state so it belongs to one session.
+    """
+
+    def __init__(self, target, *args, **kwargs):
+        self._context = contextvars.copy_context()
+        self._done = threading.Event()
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(
+            target=self._run, args=(target, args, kwargs), name="summary-job", daemon=True
+        )
+
+    def _run(self, target, args, kwargs):
+        try:
+            self.result = self._context.run(target, *args, **kwargs)
+        except Exception as e:
+            logger.error("Background job failed: %s", e)
+            self.error = e
+        finally:
+            self._done.set()
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
@@ -0,0 +1,66 @@
+# summary_utils/chunk_engine.py
+import time
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def _call_with_retries(func, item, max_retries, retry_delay):
+    """Call func(item), retrying when it raises or returns None. Returns None if every attempt fails."""
+    for attempt in range(max_retries + 1):
+        try:
+            result = func(item)
+            if result is not None:
+                return result
+        except Exception as e:
+            logger.warning("Chunk call failed (attempt %d/%d): %s", attempt + 1, max_retries + 1, e)
+        if attempt < max_retries:
+            # simple linear backoff so a struggling endpoint gets some breathing room
+            time.sleep(retry_delay * (attempt + 1))
+    return None
+
+
+def map_in_order(func, items, max_workers: int = 4, max_retries: int = 2, retry_delay: float = 1.0):
+    """
+    Apply `func` to every item on a bounded thread pool and return the results in input order.
+
+    A call that raises or returns None is retried up to `max_retries` times. Items that still fail
+    come back as None in their slot, so callers can decide how much partial failure they tolerate.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    workers = max(1, min(max_workers, len(items)))
+    if workers == 1:
+        return [_call_with_retries(func, item, max_retries, retry_delay) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk") as executor:
+        # each worker runs in a copy of the caller's context (rate-limit session and similar)
+        futures = [
+            executor.submit(contextvars.copy_context().run, _call_with_retries, func, item, max_retries, retry_delay)
+            for item in items
+        ]
+        return [future.result() for future in futures]
+
+
+def batch_items(items, max_items: int, max_chars: int = None, size=len):
+    """
+    Split `items` into consecutive batches of at most `max_items` entries whose combined `size`
+    stays within `max_chars`. An item larger than `max_chars` on its own gets a batch of its own.
+    """
+    batches, current, current_size = [], [], 0
+    for item in items:
+        item_size = size(item)
+        too_many = len(current) >= max_items
+        too_big = max_chars is not None and current and current_size + item_size > max_chars
+        if too_many or too_big:
+            batches.append(current)
+            current, current_size = [], 0
+        current.append(item)
+        current_size += item_size
+    if current:
+        batches.append(current)
+    return batches
@@ -0,0 +1,104 @@
+# summary_utils/chunker.py
+import bisect
+from array import array
+
+from summary_utils.text_cleaning import sentence_spans
+
+
+def sentence_starts(text: str):
+    """Character offsets where each sentence begins, by the same rule Document uses."""
+    return [start for start, _ in sentence_spans(text)]
+
+
+class EncodedText:
+    """One tokenization of `text`: per-token character offsets plus the model-facing token count."""
+
+    __slots__ = ("text", "starts", "ends", "num_special_tokens")
+
+    def __init__(self, text, starts, ends, num_special_tokens=0):
+        self.text = text
+        self.starts = starts
+        self.ends = ends
+        self.num_special_tokens = num_special_tokens
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def token_count(self):
+        """Tokens the model will see for the whole text, special tokens included."""
+        return len(self.starts) + self.num_special_tokens
+
+
+class TokenChunker:
+    """
+    Splits text into token-bounded chunks from a single encode.
+
+    Chunks are sliced out of the original string through the tokenizer's offset mapping, so there
+    is no decode round-trip, and chunk edges are moved back to the nearest sentence boundary when
+    one falls in the second half of the window.
+    """
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    def encode(self, text: str) -> EncodedText:
+        special = self.tokenizer.num_special_tokens_to_add(pair=False)
+        if getattr(self.tokenizer, "is_fast", False):
+            encoding = self.tokenizer(
+                text, add_special_tokens=False, return_offsets_mapping=True, return_attention_mask=False
+            )
+            offsets = encoding["offset_mapping"]
+            starts = array("l", (start for start, _ in offsets))
+            ends = array("l", (end for _, end in offsets))
+            return EncodedText(text, starts, ends, special)
+
+        # Slow tokenizers have no offset mapping: locate each decoded token in the text instead.
+        starts, ends, cursor = array("l"), array("l"), 0
+        for token_id in self.tokenizer.encode(text, add_special_tokens=False):
+            piece = self.tokenizer.decode([token_id]).strip()
+            found = text.find(piece, cursor) if piece else -1
+            start = found if found >= 0 else cursor
+            end = start + len(piece) if found >= 0 else cursor
+            starts.append(start)
+            ends.append(end)
+            cursor = end
+        return EncodedText(text, starts, ends, special)
+
+    def chunk(self, encoded: EncodedText, chunk_size: int = 800, overlap: int = 100, boundaries=None):
+        """
+        Return a list of (chunk_text, token_count) covering `encoded` with `overlap` tokens of context.
+
+        `boundaries` are sentence-start character offsets (default: from text_cleaning.sentence_spans, as
+        for a Document).
+        """
+        n = len(encoded)
+        if n == 0:
+            return []
+        if boundaries is None:
+            boundaries = sentence_starts(encoded.text)
+        # token index at which each sentence starts
+        boundary_tokens = sorted({bisect.bisect_left(encoded.starts, b) for b in boundaries})
+
+        chunks = []
+        start = 0
+        while start < n:
+            end = min(start + chunk_size, n)
+            if end < n:
+                # last sentence start inside the back half of the window
+                i = bisect.bisect_right(boundary_tokens, end) - 1
+                if i >= 0 and boundary_tokens[i] > start + chunk_size // 2:
+                    end = boundary_tokens[i]
+
+            text = encoded.text[encoded.starts[start]:encoded.ends[end - 1]]
+            chunks.append((text, end - start))
+            if end >= n:
+                break
+
+            next_start = max(end - overlap, start + 1)
+            # begin the overlap at a sentence start when one is available
+            i = bisect.bisect_left(boundary_tokens, next_start)
+            if i < len(boundary_tokens) and boundary_tokens[i] < end:
+                next_start = boundary_tokens[i]
+            start = next_start
+        return chunks
@@ -0,0 +1,84 @@
+# summary_utils/document_model.py
+import re
+from array import array
+
+from summary_utils.text_cleaning import clean_text, iter_clean_text, sentence_spans
+
+_PARAGRAPH_RE = re.compile(r'\n\n')
+
+
+class Document:
+    """
+    A cleaned document, produced once per summarization run and shared by every stage.
+
+    Sentences, paragraphs and pages are stored as character offsets into `text` in compact
+    arrays, so stages slice what they need instead of re-splitting or copying the text.
+      sentence_starts / sentence_ends - span of each sentence (whitespace-trimmed)
+      paragraph_starts                - offset where each paragraph begins
+      page_starts                     - offset where each source page begins (when built from pages;
+                                        snapped to the line the cleaner carried over the page break)
+    """
+
+    __slots__ = ("text", "sentence_starts", "sentence_ends", "paragraph_starts", "page_starts",
+                 "_word_count", "_sentences")
+
+    def __init__(self, text: str, page_starts=None):
+        self.text = text
+        self.sentence_starts = array("l")
+        self.sentence_ends = array("l")
+        for start, end in sentence_spans(text):
+            self.sentence_starts.append(start)
+            self.sentence_ends.append(end)
+        self.paragraph_starts = array("l", [0] if text else [])
+        self.paragraph_starts.extend(m.end() for m in _PARAGRAPH_RE.finditer(text))
+        self.page_starts = array("l", page_starts or ([0] if text else []))
+        self._word_count = None
+        self._sentences = None
+
+    @classmethod
+    def from_raw(cls, raw_text):
+        """Clean `raw_text` (a string or an iterable of page strings) and index it."""
+        if isinstance(raw_text, str):
+            return cls(clean_text(raw_text))
+        pieces, page_starts, length = [], [], 0
+        for piece in iter_clean_text(_track_pages(raw_text, page_starts, lambda: length)):
+            pieces.append(piece)
+            length += len(piece)
+        return cls("".join(pieces), page_starts)
+
+    def __len__(self):
+        return len(self.text)
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_starts)
+
+    @property
+    def word_count(self) -> int:
+        if self._word_count is None:
+            self._word_count = len(self.text.split())
+        return self._word_count
+
+    def sentence(self, index: int) -> str:
+        return self.text[self.sentence_starts[index]:self.sentence_ends[index]]
+
+    def sentences(self):
+        """All sentences as strings, sliced once and reused by later stages."""
+        if self._sentences is None:
+            text, ends = self.text, self.sentence_ends
+            self._sentences = [text[start:ends[i]] for i, start in enumerate(self.sentence_starts)]
+        return self._sentences
+
+
+def _track_pages(pages, page_starts, current_length):
+    """Pass pages through, recording the cleaned length reached when each page is read."""
+    for page in pages:
+        page_starts.append(current_length())
+        yield page
+
+
+def as_document(text_or_document) -> Document:
+    """Accept either an already-built Document or cleaned text."""
+    if isinstance(text_or_document, Document):
+        return text_or_document
+    return Document(text_or_document)
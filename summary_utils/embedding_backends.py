@@ -0,0 +1,73 @@
+# summary_utils/embedding_backends.py
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Every backend exposes embed(sentences) -> float32 matrix (len(sentences), dim), or None on failure.
+
+class RemoteEmbeddingBackend:
+    """Embeddings from the Hugging Face router. `embed_fn` is the page's batched BGE request helper."""
+
+    name = "remote"
+
+    def __init__(self, embed_fn):
+        self._embed_fn = embed_fn
+
+    def embed(self, sentences):
+        embeddings = self._embed_fn(sentences)
+        if not embeddings:
+            return None
+        return np.asarray(embeddings, dtype=np.float32)
+
+
+class LocalBGEEmbeddingBackend:
+    """
+    bge-small-en-v1.5 running in-process on CPU with torch.
+
+    Sentences are sorted by token length and batched, so each batch is padded only to the
+    longest sentence in it rather than the longest in the document (length bucketing).
+    Output follows the BGE recipe: CLS token embedding, L2-normalized.
+    """
+
+    name = "local"
+
+    def __init__(self, model_name: str = "BAAI/bge-small-en-v1.5", num_threads: int = 4,
+                 batch_size: int = 32, max_length: int = 512):
+        import torch
+        from transformers import AutoTokenizer, AutoModel
+
+        self._torch = torch
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name)
+        self.model.eval()
+        logger.info("Loaded local embedding model %s (%d threads)", model_name, torch.get_num_threads())
+
+    def embed(self, sentences):
+        if not sentences:
+            return np.empty((0, self.model.config.hidden_size), dtype=np.float32)
+
+        encoded = self.tokenizer(list(sentences), truncation=True, max_length=self.max_length)
+        input_ids = encoded["input_ids"]
+        order = sorted(range(len(sentences)), key=lambda i: len(input_ids[i]))
+        output = np.empty((len(sentences), self.model.config.hidden_size), dtype=np.float32)
+
+        with self._torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch_rows = order[start:start + self.batch_size]
+                batch = self.tokenizer.pad(
+                    {"input_ids": [input_ids[i] for i in batch_rows]},
+                    padding=True,
+                    return_tensors="pt",
+                )
+                hidden = self.model(**batch).last_hidden_state[:, 0]
+                hidden = self._torch.nn.functional.normalize(hidden, p=2, dim=1)
+                output[batch_rows] = hidden.numpy()
+
+        return output
@@ -0,0 +1,118 @@
+# summary_utils/embedding_store.py
+import os
+import hashlib
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KEY_BYTES = 16
+
+
+def sentence_key(sentence: str) -> bytes:
+    """16-byte digest of the whitespace-normalized sentence."""
+    normalized = " ".join(sentence.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=KEY_BYTES).digest()
+
+
+class EmbeddingStore:
+    """
+    Sentence-level embedding store backed by a float32 memory-mapped matrix on disk.
+
+    Layout of `directory`:
+        vectors.f32 - raw float32 rows of shape (capacity, dim), memory-mapped
+        keys.bin    - one 16-byte sentence digest per stored row, in row order
+
+    A row is only "committed" once its key is appended, so a crash mid-write leaves at worst an
+    unused vector slot. Meant for one Streamlit process; access is serialized with a lock.
+    """
+
+    def __init__(self, directory: str, dim: int = 384, initial_capacity: int = 4096):
+        self.dim = dim
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._keys_path = os.path.join(directory, "keys.bin")
+
+        self._rows = {}
+        if os.path.exists(self._keys_path):
+            with open(self._keys_path, "rb") as f:
+                raw = f.read()
+            count = len(raw) // KEY_BYTES
+            for row in range(count):
+                self._rows[raw[row * KEY_BYTES:(row + 1) * KEY_BYTES]] = row
+        self._count = len(self._rows)
+
+        row_bytes = dim * np.dtype(np.float32).itemsize
+        existing_rows = os.path.getsize(self._vectors_path) // row_bytes if os.path.exists(self._vectors_path) else 0
+        self._vectors = None
+        self._map(max(existing_rows, initial_capacity, self._count))
+        self._keys_file = open(self._keys_path, "ab")
+
+    def _map(self, capacity: int):
+        """(Re)map the vectors file with room for `capacity` rows, growing the file if needed."""
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        needed = capacity * self.dim * np.dtype(np.float32).itemsize
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < needed:
+                f.truncate(needed)
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._capacity = capacity
+
+    def __len__(self):
+        return self._count
+
+    def _append(self, keys, vectors):
+        """Write new rows and commit their keys. Caller holds the lock."""
+        needed = self._count + len(keys)
+        if needed > self._capacity:
+            self._map(max(needed, self._capacity * 2))
+        self._vectors[self._count:needed] = vectors
+        self._vectors.flush()
+        self._keys_file.write(b"".join(keys))
+        self._keys_file.flush()
+        for offset, key in enumerate(keys):
+            self._rows[key] = self._count + offset
+        self._count = needed
+
+    def get_or_compute(self, sentences, embed_fn):
+        """
+        Return a contiguous float32 matrix (len(sentences), dim) of embeddings.
+
+        Only sentences not yet in the store are passed to `embed_fn(list_of_sentences)`, each unique
+        sentence once. Returns None if `embed_fn` fails (returns None or the wrong number of vectors).
+        """
+        keys = [sentence_key(s) for s in sentences]
+        with self._lock:
+            missing = {}
+            for key, sentence in zip(keys, sentences):
+                if key not in self._rows and key not in missing:
+                    missing[key] = sentence
+
+        if missing:
+            computed = embed_fn(list(missing.values()))
+            if computed is None:
+                return None
+            computed = np.asarray(computed, dtype=np.float32)
+            if computed.ndim != 2 or computed.shape != (len(missing), self.dim):
+                logger.warning("Embedding backend returned shape %s, expected (%d, %d)",
+                               computed.shape, len(missing), self.dim)
+                return None
+            with self._lock:
+                new_keys, new_vectors = [], []
+                for key, vector in zip(missing, computed):
+                    # another session may have stored it while we were waiting on the backend
+                    if key not in self._rows:
+                        new_keys.append(key)
+                        new_vectors.append(vector)
+                if new_keys:
+                    self._append(new_keys, np.stack(new_vectors))
+
+        with self._lock:
+            rows = np.fromiter((self._rows[k] for k in keys), dtype=np.int64, count=len(keys))
+            # fancy indexing copies the rows out into one contiguous in-memory matrix
+            return np.ascontiguousarray(self._vectors[rows])
@@ -0,0 +1,25 @@
+# summary_utils/extracted_document.py
+import streamlit as st
+
+from summary_utils.settings import get_setting
+from summary_utils.page_store import PageStore, document_preview
+
+# Large documents are kept on disk in the page store; session state only holds their ID
+PAGE_STORE_DIR = get_setting("page_store_dir", ".page_store")
+PREVIEW_MAX_CHARS = get_setting("preview_max_chars", 20000)
+
+
+@st.cache_resource
+def get_page_store():
+    """Disk-backed store for extracted large documents, shared by all sessions and pages (IDs are per session)."""
+    return PageStore(PAGE_STORE_DIR)
+
+
+def extracted_preview() -> str:
+    """Preview of this session's extracted document, from the page store or session state."""
+    return document_preview(
+        get_page_store(),
+        st.session_state.get('extracted_doc_id'),
+        st.session_state.get('extracted_text', ""),
+        PREVIEW_MAX_CHARS,
+    )
@@ -0,0 +1,175 @@
+# summary_utils/fetch_cache.py
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class FetchCache:
+    """
+    On-disk cache of fetched web pages for URL ingestion.
+
+    Each entry keeps the (compressed) response body, the text extracted from it, the extractor
+    version that produced that text and the validators (ETag / Last-Modified). Entries younger
+    than `ttl_seconds` are served without touching the network; older ones are revalidated with
+    a conditional GET. Total stored bytes are capped at `max_bytes`, least recently used first out.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, ttl_seconds: float = 3600.0):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS fetch_cache ("
+            " url TEXT PRIMARY KEY, body BLOB NOT NULL, text TEXT NOT NULL, extractor TEXT NOT NULL,"
+            " etag TEXT, last_modified TEXT, size INTEGER NOT NULL,"
+            " validated_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fetch_cache_access ON fetch_cache(last_access)")
+        self._conn.commit()
+
+    def lookup(self, url: str):
+        """The cached entry for `url` as a dict (fresh or stale), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, text, extractor, etag, last_modified, validated_at FROM fetch_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE fetch_cache SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        body, text, extractor, etag, last_modified, validated_at = row
+        return {
+            "body": body,
+            "text": text,
+            "extractor": extractor,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": bool(self.ttl_seconds) and time.time() - validated_at < self.ttl_seconds,
+        }
+
+    def store(self, url: str, body: str, text: str, extractor: str, etag: str = None, last_modified: str = None):
+        compressed = zlib.compress(body.encode("utf-8"))
+        size = len(compressed) + len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fetch_cache"
+                " (url, body, text, extractor, etag, last_modified, size, validated_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, compressed, text, extractor, etag, last_modified, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def update_text(self, url: str, text: str, extractor: str):
+        """Replace the extracted text after re-extracting a cached body with a newer extractor."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE fetch_cache SET text = ?, extractor = ?,"
+                " size = length(body) + length(CAST(? AS BLOB)) WHERE url = ?",
+                (text, extractor, text, url),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def mark_validated(self, url: str, etag: str = None, last_modified: str = None):
+        """Record a 304: the entry is fresh again, with any updated validators."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE fetch_cache SET validated_at = ?, etag = COALESCE(?, etag),"
+                " last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (time.time(), etag, last_modified, url),
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        # drop least recently used entries until the total fits; called with the lock held
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM fetch_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for url, size in self._conn.execute("SELECT url, size FROM fetch_cache ORDER BY last_access ASC"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM fetch_cache WHERE url = ?", evicted)
+
+    def record(self, outcome: str):
+        """Count one lookup outcome: "hits", "revalidated" or "misses"."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM fetch_cache").fetchone()
+        return {
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+        }
+
+
+def _cacheable(response) -> bool:
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    return "no-store" not in cache_control
+
+
+def fetch_text(url: str, get, extract, extractor_version: str, cache: FetchCache = None, headers: dict = None):
+    """
+    Extracted text of `url`, going to the network only when needed.
+
+    `get(url, headers)` performs the GET and returns a requests Response; `extract(html)` turns a
+    page into text. A fresh cache entry is returned as is; a stale one is revalidated with
+    If-None-Match / If-Modified-Since and, on 304, reused without parsing the page again (the body
+    is only re-extracted when the extractor version changed). Raises what `get` or
+    `raise_for_status` raise.
+    """
+    headers = dict(headers or {})
+    entry = cache.lookup(url) if cache is not None else None
+
+    def cached_text():
+        if entry["extractor"] == extractor_version:
+            return entry["text"]
+        text = extract(zlib.decompress(entry["body"]).decode("utf-8"))
+        cache.update_text(url, text, extractor_version)
+        return text
+
+    if entry is not None:
+        if entry["fresh"]:
+            cache.record("hits")
+            return cached_text()
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = get(url, headers)
+    if response.status_code == 304 and entry is not None:
+        cache.record("revalidated")
+        cache.mark_validated(url, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return cached_text()
+
+    response.raise_for_status()
+    html = response.text
+    text = extract(html)
+    if cache is not None:
+        cache.record("misses")
+        if _cacheable(response):
+            cache.store(url, html, text, extractor_version,
+                        response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return text
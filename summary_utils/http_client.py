@@ -0,0 +1,115 @@
+# summary_utils/http_client.py
+import time
+import random
+import logging
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RateLimitTimeout(requests.exceptions.RequestException):
+    """The request waited longer than the queue timeout for a rate-limit token and was never sent."""
+
+# (connect, read) timeouts in seconds per endpoint
+DEFAULT_TIMEOUTS = {
+    "chat": (5, 60),
+    "summarization": (5, 60),
+    "embeddings": (5, 60),
+    "fetch": (5, 10),
+}
+
+
+def _retry_after_seconds(response):
+    """
+    How long the server asked us to wait: the Retry-After header (seconds or HTTP date), or the
+    `estimated_time` the Hugging Face router reports while a cold model loads. None if neither is set.
+    """
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(header).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    try:
+        estimated = response.json().get("estimated_time")
+        if estimated is not None:
+            return max(0.0, float(estimated))
+    except (ValueError, AttributeError):
+        pass
+    return None
+
+
+class HttpClient:
+    """
+    Process-wide HTTP client for every model and fetch call.
+
+    One requests.Session keeps TLS connections alive in a pool sized for our concurrency, so
+    repeated calls to the router skip the handshake. Failed requests (connection errors, timeouts,
+    429/5xx) are retried with full-jitter exponential backoff, honoring Retry-After and the
+    router's `estimated_time`. With a RateLimiter every attempt first waits for a token for its
+    endpoint, so bursts are smoothed client-side instead of bouncing off the router's 429s.
+    """
+
+    def __init__(self, pool_size: int = 16, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 20.0, timeouts: dict = None, rate_limiter=None,
+                 queue_timeout: float = None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.rate_limiter = rate_limiter
+        self.queue_timeout = queue_timeout
+        self.session = requests.Session()
+        # retries are handled here, not by urllib3, so Retry-After/estimated_time can be honored
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method: str, url: str, endpoint: str = "chat", max_retries: int = None, **kwargs):
+        """
+        Send a request and return the final Response (callers still call raise_for_status()).
+        Raises requests.exceptions.RequestException if the last attempt fails to connect, or
+        RateLimitTimeout if no rate-limit token became available within `queue_timeout`.
+        """
+        kwargs.setdefault("timeout", self.timeouts.get(endpoint, DEFAULT_TIMEOUTS["chat"]))
+        retries = self.max_retries if max_retries is None else max_retries
+
+        for attempt in range(retries + 1):
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(endpoint, timeout=self.queue_timeout):
+                raise RateLimitTimeout(f"No {endpoint} rate-limit token within {self.queue_timeout}s")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning("%s %s failed (%s), retry %d/%d in %.1fs", method, endpoint, e, attempt + 1, retries, delay)
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                return response
+
+            requested = _retry_after_seconds(response)
+            delay = min(self.backoff_max, requested) if requested is not None else self._backoff(attempt)
+            logger.warning("%s %s returned %d, retry %d/%d in %.1fs",
+                           method, endpoint, response.status_code, attempt + 1, retries, delay)
+            response.close()
+            time.sleep(delay)
+
+    def get(self, url: str, endpoint: str = "fetch", **kwargs):
+        return self.request("GET", url, endpoint=endpoint, **kwargs)
+
+    def post(self, url: str, endpoint: str = "chat", **kwargs):
+        return self.request("POST", url, endpoint=endpoint, **kwargs)
@@ -0,0 +1,132 @@
+# summary_utils/ocr.py
+import os
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# A page with less extracted text than this is treated as scanned
+MIN_TEXT_CHARS = 20
+
+
+def needs_ocr(page_text: str) -> bool:
+    return len((page_text or "").strip()) < MIN_TEXT_CHARS
+
+
+def load_reader(languages=("en",), gpu: bool = False):
+    """Create the easyocr Reader. Slow (loads detection + recognition models); callers should cache it."""
+    import easyocr
+
+    return easyocr.Reader(list(languages), gpu=gpu)
+
+
+def render_page(doc, index: int, dpi: int):
+    """Render one PyMuPDF page to an RGB uint8 array."""
+    import fitz
+
+    pix = doc.load_page(index).get_pixmap(dpi=dpi, colorspace=fitz.csRGB, alpha=False)
+    return np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n).copy()
+
+
+def preprocess(image):
+    """Grayscale, deskew (small angles only) and Otsu-binarize a page image for OCR."""
+    import cv2
+
+    gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY) if image.ndim == 3 else image
+
+    ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+    coords = cv2.findNonZero(ink)
+    if coords is not None:
+        angle = cv2.minAreaRect(coords)[-1]
+        # OpenCV versions disagree on the angle range; bring it into (-45, 45]
+        if angle < -45:
+            angle += 90
+        elif angle > 45:
+            angle -= 90
+        if 0.1 < abs(angle) < 15:
+            h, w = gray.shape
+            matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+            gray = cv2.warpAffine(gray, matrix, (w, h), flags=cv2.INTER_CUBIC, borderMode=cv2.BORDER_REPLICATE)
+
+    return cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
+
+
+def _page_key(image, dpi: int) -> str:
+    """Cache key for a rendered page: its pixels, so identical pages in any upload share an entry."""
+    h = hashlib.sha256()
+    h.update(f"{image.shape}:{dpi}".encode("utf-8"))
+    h.update(image.tobytes())
+    return h.hexdigest()
+
+
+def _recognize(reader, images, batch_size):
+    """Run easyocr over preprocessed images in batches. Returns one text (or None on failure) per image."""
+    texts = [None] * len(images)
+    # readtext_batched needs images of one size per call
+    by_shape = {}
+    for position, image in enumerate(images):
+        by_shape.setdefault(image.shape, []).append(position)
+
+    for positions in by_shape.values():
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            try:
+                lines = reader.readtext_batched([images[p] for p in batch], detail=0, paragraph=True)
+            except Exception as e:
+                logger.error("OCR batch of %d pages failed: %s", len(batch), e)
+                continue
+            for p, page_lines in zip(batch, lines):
+                texts[p] = "\n".join(page_lines)
+    return texts
+
+
+def ocr_pages(source, page_indices, reader, dpi: int = 200, batch_size: int = 4,
+              max_workers: int = 4, cache=None):
+    """
+    OCR the given pages of a PDF (a path or bytes) and return {page_index: text}.
+
+    Pages are handled in small windows so only a few rendered pages are in memory at once. Each page
+    is rendered, looked up in `cache` (anything with get/set, e.g. summary_cache.SQLiteBackend) by
+    pixel hash, preprocessed on a thread pool (OpenCV releases the GIL), and the misses are
+    recognized with `reader` in batches. Pages that fail OCR are left out of the result.
+    """
+    import fitz
+
+    page_indices = list(page_indices)
+    results = {}
+    if not page_indices:
+        return results
+
+    window = max(batch_size, max_workers, 1) * 2
+    doc = fitz.open(source) if isinstance(source, (str, os.PathLike)) else fitz.open(stream=source, filetype="pdf")
+    with doc, \
+            ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="ocr-prep") as executor:
+        for start in range(0, len(page_indices), window):
+            todo, images, keys = [], [], []
+            # PyMuPDF is not thread-safe, so pages are rendered serially
+            for index in page_indices[start:start + window]:
+                image = render_page(doc, index, dpi)
+                key = _page_key(image, dpi)
+                cached = cache.get(key) if cache is not None else None
+                if cached is not None:
+                    results[index] = cached
+                    continue
+                todo.append(index)
+                images.append(image)
+                keys.append(key)
+            if not todo:
+                continue
+
+            prepared = list(executor.map(preprocess, images))
+            del images
+            for index, key, text in zip(todo, keys, _recognize(reader, prepared, batch_size)):
+                if text is None:
+                    continue
+                results[index] = text
+                if cache is not None and text.strip():
+                    cache.set(key, text)
+
+    return results
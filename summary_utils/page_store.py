@@ -0,0 +1,152 @@
+# summary_utils/page_store.py
+import os
+import json
+import time
+import uuid
+import shutil
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def spill_to_disk(fileobj, directory: str, suffix: str = "") -> str:
+    """Copy an upload to a new file in `directory` in 1 MB chunks and return its path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid.uuid4().hex}{suffix}")
+    if hasattr(fileobj, "seek"):
+        fileobj.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(fileobj, out, COPY_CHUNK_BYTES)
+    return path
+
+
+class _PageWriter:
+    """Appends pages for one document; metadata is written when the writer is closed."""
+
+    def __init__(self, store, doc_id):
+        self.store = store
+        self.doc_id = doc_id
+        self._file = open(store._text_path(doc_id), "wb")
+        self._page_ends = []
+        self._word_count = 0
+
+    def add_page(self, text: str):
+        self._file.write(text.encode("utf-8"))
+        self._page_ends.append(self._file.tell())
+        self._word_count += len(text.split())
+
+    def close(self):
+        self._file.close()
+        meta = {"page_ends": self._page_ends, "word_count": self._word_count, "created_at": time.time()}
+        with open(self.store._meta_path(self.doc_id), "w") as f:
+            json.dump(meta, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        if exc_type is not None:
+            self.store.delete(self.doc_id)
+
+
+class PageStore:
+    """
+    Disk-backed store for extracted documents, so session state only has to hold an ID.
+
+    Each document is `<id>.txt` (pages back to back, UTF-8) plus `<id>.json` with the byte offset
+    where each page ends and the word count. Documents older than `max_age_seconds` are purged
+    when a new document is written, at most once per `purge_interval_seconds`, so files left by
+    ended sessions don't pile up on a long-running server.
+    """
+
+    def __init__(self, root: str, max_age_seconds: float = 24 * 3600, purge_interval_seconds: float = 600.0):
+        self.root = root
+        self.max_age_seconds = max_age_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._last_purge = float("-inf")
+        self._purge_lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _text_path(self, doc_id):
+        return os.path.join(self.root, f"{doc_id}.txt")
+
+    def _meta_path(self, doc_id):
+        return os.path.join(self.root, f"{doc_id}.json")
+
+    def writer(self) -> _PageWriter:
+        self._purge_if_due()
+        return _PageWriter(self, uuid.uuid4().hex)
+
+    def _purge_if_due(self):
+        with self._purge_lock:
+            now = time.monotonic()
+            if now - self._last_purge < self.purge_interval_seconds:
+                return
+            self._last_purge = now
+        self.purge_expired()
+
+    def exists(self, doc_id) -> bool:
+        return bool(doc_id) and os.path.exists(self._meta_path(doc_id))
+
+    def _meta(self, doc_id):
+        with open(self._meta_path(doc_id)) as f:
+            return json.load(f)
+
+    def page_count(self, doc_id) -> int:
+        return len(self._meta(doc_id)["page_ends"])
+
+    def word_count(self, doc_id) -> int:
+        return self._meta(doc_id)["word_count"]
+
+    def iter_pages(self, doc_id):
+        """Yield pages one at a time without loading the whole document."""
+        start = 0
+        with open(self._text_path(doc_id), "rb") as f:
+            for end in self._meta(doc_id)["page_ends"]:
+                yield f.read(end - start).decode("utf-8")
+                start = end
+
+    def read_text(self, doc_id, separator: str = "\n") -> str:
+        return separator.join(self.iter_pages(doc_id))
+
+    def preview(self, doc_id, max_chars: int) -> str:
+        """The first `max_chars` characters, read from the start of the file only."""
+        with open(self._text_path(doc_id), "rb") as f:
+            # UTF-8 is at most 4 bytes per character; drop a partially read trailing character
+            head = f.read(max_chars * 4).decode("utf-8", errors="ignore")
+        return head[:max_chars]
+
+    def delete(self, doc_id):
+        for path in (self._text_path(doc_id), self._meta_path(doc_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def purge_expired(self):
+        cutoff = time.time() - self.max_age_seconds
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError as e:
+                logger.debug("Could not purge %s: %s", path, e)
+
+
+def document_preview(store: PageStore, doc_id, text: str, max_chars: int) -> str:
+    """
+    The start of an extracted document for display: read from `store` when `doc_id` is stored
+    there, else taken from the in-memory `text`. Marked when cut at `max_chars`.
+    """
+    if store.exists(doc_id):
+        preview = store.preview(doc_id, max_chars)
+    else:
+        preview = text[:max_chars]
+    if len(preview) >= max_chars:
+        preview += "\n\n[... preview truncated ...]"
+    return preview
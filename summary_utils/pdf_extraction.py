@@ -0,0 +1,117 @@
+# summary_utils/pdf_extraction.py
+import os
+import mmap
+import logging
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Below this many pages a process pool costs more to start than it saves
+PARALLEL_MIN_PAGES = 64
+PAGES_PER_TASK = 16
+
+
+def _read_source(source):
+    """Return the PDF as bytes from bytes or a file-like object (e.g. Streamlit's UploadedFile)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source.read()
+
+
+def _open_document(source):
+    """Open with PyMuPDF. Paths are opened directly so the file is never loaded into memory."""
+    import fitz
+
+    if isinstance(source, (str, os.PathLike)):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _extract_page_range(path: str, start: int, end: int):
+    """Worker: text of pages [start, end) of the PDF at `path`. Runs in a separate process."""
+    import fitz
+
+    with fitz.open(path) as doc:
+        return [doc.load_page(i).get_text("text") for i in range(start, end)]
+
+
+def _iter_pages_pymupdf(source, max_workers: int):
+    with _open_document(source) as doc:
+        page_count = doc.page_count
+        if page_count < PARALLEL_MIN_PAGES or max_workers <= 1:
+            for page in doc:
+                yield page.get_text("text")
+            return
+
+    # Large document: workers open their own copy from disk and extract page ranges.
+    temp_path = None
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+    else:
+        fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(source)
+        path = temp_path
+    try:
+        # spawn, not fork: forking a multi-threaded Streamlit server is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(_extract_page_range, path, start, min(start + PAGES_PER_TASK, page_count))
+                for start in range(0, page_count, PAGES_PER_TASK)
+            ]
+            # yield in page order as soon as each range is ready
+            for future in futures:
+                yield from future.result()
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+
+
+def _iter_pages_pypdf2(source):
+    from io import BytesIO
+    from PyPDF2 import PdfReader
+
+    if isinstance(source, (str, os.PathLike)):
+        # memory-map the spilled file so PyPDF2 reads pages on demand instead of a full copy
+        with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for page in PdfReader(mapped).pages:
+                yield page.extract_text() or ""
+        return
+
+    for page in PdfReader(BytesIO(source)).pages:
+        yield page.extract_text() or ""
+
+
+def iter_pdf_pages(source, max_workers: int = None):
+    """
+    Yield the text of each page of a PDF, in order, as soon as it is available.
+
+    `source` may be a path (preferred for large uploads: it is never read into memory), bytes, or a
+    file-like object. Uses PyMuPDF, spreading large documents over a process pool, and falls back to
+    PyPDF2 when PyMuPDF is unavailable or cannot open the file. If PyMuPDF fails midway, the
+    remaining pages are taken from PyPDF2 so no page is yielded twice.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        source = _read_source(source)
+    if max_workers is None:
+        max_workers = min(4, os.cpu_count() or 1)
+
+    yielded = 0
+    try:
+        for text in _iter_pages_pymupdf(source, max_workers):
+            yield text
+            yielded += 1
+        return
+    except Exception as e:
+        logger.warning("PyMuPDF extraction failed after %d pages, falling back to PyPDF2: %s", yielded, e)
+
+    for index, text in enumerate(_iter_pages_pypdf2(source)):
+        if index >= yielded:
+            yield text
@@ -0,0 +1,203 @@
+# summary_utils/rate_limiter.py
+import time
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+
+# Which session the current request belongs to. Set once per pipeline run with session_scope();
+# worker pools copy the context so chunk and stage threads inherit it.
+_current_session = contextvars.ContextVar("rate_limit_session", default="default")
+
+WAIT_SAMPLES = 1000
+
+
+@contextmanager
+def session_scope(session_id: str):
+    token = _current_session.set(session_id)
+    try:
+        yield
+    finally:
+        _current_session.reset(token)
+
+
+def current_session() -> str:
+    return _current_session.get()
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`. Not thread-safe."""
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.clock = clock
+        self.tokens = float(capacity)
+        self._last = clock()
+
+    def try_take(self) -> float:
+        """Take one token if available and return 0, otherwise return the seconds until one is."""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class FairScheduler:
+    """
+    Rate-limited admission to one endpoint, shared fairly between sessions.
+
+    Each session gets its own FIFO queue and sessions are served round-robin, so a session
+    with 40 queued chunk requests takes one token per turn and a session asking for a single
+    request waits behind at most one request per other active session.
+    """
+
+    def __init__(self, rate: float, burst: float, clock=time.monotonic):
+        self.clock = clock
+        self._bucket = TokenBucket(rate, burst, clock)
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()  # session id -> deque of waiting tickets, in service order
+        self._depth = 0
+        self._granted = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recent_waits = deque(maxlen=WAIT_SAMPLES)
+        self._async_waiters = []  # (loop, asyncio.Event) woken whenever the queues change
+
+    def _remove(self, session_id, ticket, served: bool):
+        queue = self._queues[session_id]
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[session_id]
+        elif served:
+            # round-robin: the session just served goes to the back of the line
+            self._queues.move_to_end(session_id)
+        self._depth -= 1
+        self._cond.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, woken in waiters:
+            try:
+                loop.call_soon_threadsafe(woken.set)
+            except RuntimeError:  # that loop has been closed
+                pass
+
+    def _enqueue(self, session_id):
+        ticket = object()
+        self._queues.setdefault(session_id, deque()).append(ticket)
+        self._depth += 1
+        return ticket
+
+    def _poll(self, session_id, ticket, start, timeout):
+        """
+        One admission check, with the lock held. Returns (True, None) when the ticket is granted,
+        (False, None) when its timeout expired, else (None, seconds to wait or None for a wake-up).
+        """
+        head_session = next(iter(self._queues))
+        wait = None
+        if self._queues[head_session][0] is ticket:
+            wait = self._bucket.try_take()
+            if wait == 0:
+                self._remove(session_id, ticket, served=True)
+                waited = self.clock() - start
+                self._granted += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+                self._recent_waits.append(waited)
+                return True, None
+        if timeout is not None:
+            remaining = timeout - (self.clock() - start)
+            if remaining <= 0:
+                self._remove(session_id, ticket, served=False)
+                self._timeouts += 1
+                return False, None
+            wait = remaining if wait is None else min(wait, remaining)
+        return None, wait
+
+    def acquire(self, session_id: str = None, timeout: float = None) -> bool:
+        """Block until this session's turn comes up and a token is free. False if `timeout` expires first."""
+        session_id = session_id or current_session()
+        start = self.clock()
+        with self._cond:
+            ticket = self._enqueue(session_id)
+            while True:
+                granted, wait = self._poll(session_id, ticket, start, timeout)
+                if granted is not None:
+                    return granted
+                self._cond.wait(wait)
+
+    async def acquire_async(self, session_id: str = None, timeout: float = None) -> bool:
+        """
+        acquire() for coroutines: waits on the running event loop instead of blocking a thread, in
+        the same queues as blocking callers.
+        """
+        session_id = session_id or current_session()
+        loop = asyncio.get_running_loop()
+        start = self.clock()
+        with self._cond:
+            ticket = self._enqueue(session_id)
+        try:
+            while True:
+                with self._cond:
+                    granted, wait = self._poll(session_id, ticket, start, timeout)
+                    if granted is not None:
+                        ticket = None
+                        return granted
+                    woken = asyncio.Event()
+                    self._async_waiters.append((loop, woken))
+                try:
+                    await asyncio.wait_for(woken.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if ticket is not None:  # cancelled while queued
+                with self._cond:
+                    self._remove(session_id, ticket, served=False)
+
+    def stats(self) -> dict:
+        with self._cond:
+            waits = sorted(self._recent_waits)
+            return {
+                "queue_depth": self._depth,
+                "waiting_sessions": len(self._queues),
+                "granted": self._granted,
+                "timeouts": self._timeouts,
+                "mean_wait": self._total_wait / self._granted if self._granted else 0.0,
+                "p95_wait": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                "max_wait": self._max_wait,
+            }
+
+
+class RateLimiter:
+    """
+    Process-wide client-side rate limits, one FairScheduler per endpoint.
+
+    `limits` maps endpoint name -> (requests per second, burst). Endpoints without a limit
+    (e.g. "fetch") are admitted immediately.
+    """
+
+    def __init__(self, limits: dict, clock=time.monotonic):
+        self._schedulers = {
+            endpoint: FairScheduler(rate, burst, clock)
+            for endpoint, (rate, burst) in limits.items()
+            if rate and rate > 0
+        }
+
+    def acquire(self, endpoint: str, session_id: str = None, timeout: float = None) -> bool:
+        scheduler = self._schedulers.get(endpoint)
+        if scheduler is None:
+            return True
+        return scheduler.acquire(session_id, timeout)
+
+    async def acquire_async(self, endpoint: str, session_id: str = None, timeout: float = None) -> bool:
+        scheduler = self._schedulers.get(endpoint)
+        if scheduler is None:
+            return True
+        return await scheduler.acquire_async(session_id, timeout)
+
+    def stats(self) -> dict:
+        return {endpoint: scheduler.stats() for endpoint, scheduler in self._schedulers.items()}
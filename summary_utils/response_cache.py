@@ -0,0 +1,206 @@
+# summary_utils/response_cache.py
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import functools
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Cache hits only move an entry in memory; their access times reach SQLite in batches of this many
+# (or with the next write), so a hit never costs a disk commit of its own
+ACCESS_FLUSH_BATCH = 64
+
+
+def make_payload_key(namespace: str, payload) -> str:
+    """Key for one model call: the endpoint namespace plus the exact JSON payload."""
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(f"{namespace}\0{raw}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Byte-bounded LRU cache of model responses.
+
+    Responses are held as their JSON encoding, so the size accounting is the real number of bytes kept.
+    With `persist_path` every entry is mirrored to SQLite (write-through, evictions included),
+    and the most recently used entries are reloaded on the next start. Access times from hits are
+    written lazily, with the next write or once ACCESS_FLUSH_BATCH of them are pending.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, persist_path: str = None):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> encoded response (bytes)
+        self._accessed = {}  # key -> last access time not yet written to SQLite
+        self._lock = threading.Lock()
+        self._conn = None
+        if persist_path:
+            self._open_store(persist_path)
+
+    def _open_store(self, path):
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.commit()
+            rows = self._conn.execute("SELECT key, value FROM response_cache ORDER BY last_access DESC").fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Response cache persistence disabled: %s", e)
+            self._conn = None
+            return
+
+        stale = []
+        for key, value in rows:
+            if self.current_bytes + len(value) > self.max_bytes:
+                stale.append((key,))
+                continue
+            self._entries[key] = value
+            self._entries.move_to_end(key, last=False)  # rows come newest first
+            self.current_bytes += len(value)
+        if stale:
+            self._conn.executemany("DELETE FROM response_cache WHERE key = ?", stale)
+            self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if self._conn is not None:
+                self._accessed[key] = time.time()
+                if len(self._accessed) >= ACCESS_FLUSH_BATCH:
+                    self._flush_access_times()
+                    self._conn.commit()
+        return json.loads(value)
+
+    def _flush_access_times(self):
+        # called with the lock held; the caller commits
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE response_cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def flush(self):
+        """Write pending access times to SQLite (e.g. before shutdown)."""
+        with self._lock:
+            if self._conn is not None and self._accessed:
+                self._flush_access_times()
+                self._conn.commit()
+
+    def set(self, key, response):
+        value = json.dumps(response).encode("utf-8")
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = value
+            self.current_bytes += len(value)
+
+            evicted = []
+            while self.current_bytes > self.max_bytes:
+                old_key, old_value = self._entries.popitem(last=False)
+                self.current_bytes -= len(old_value)
+                self._accessed.pop(old_key, None)
+                evicted.append((old_key,))
+
+            if self._conn is not None:
+                self._accessed.pop(key, None)
+                self._flush_access_times()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, value, last_access) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+                if evicted:
+                    self._conn.executemany("DELETE FROM response_cache WHERE key = ?", evicted)
+                self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _is_non_deterministic(payload) -> bool:
+    """Sampling calls (temperature > 0 or do_sample) give a different answer every time; don't memoize them."""
+    if not isinstance(payload, dict):
+        return False
+    if (payload.get("temperature") or 0) > 0:
+        return True
+    return bool((payload.get("parameters") or {}).get("do_sample"))
+
+
+def memoize_payload(namespace: str, get_cache):
+    """
+    Decorator for `func(payload)` model helpers. Responses are cached by the exact payload.
+
+    `get_cache` is called lazily and may return None to disable caching. The wrapped function takes an
+    extra `bypass_cache` argument: True always calls through, False always uses the cache, and the
+    default None bypasses the cache only for non-deterministic payloads. None responses are never stored.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(payload, bypass_cache: bool = None):
+            if bypass_cache is None:
+                bypass_cache = _is_non_deterministic(payload)
+            cache = None if bypass_cache else get_cache()
+            if cache is None:
+                return func(payload)
+
+            key = make_payload_key(namespace, payload)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            response = func(payload)
+            if response is not None:
+                cache.set(key, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def memoize_payloads(namespace: str, get_cache):
+    """
+    Batch counterpart of memoize_payload for `func(payloads)` helpers that return one response per
+    payload, in order. Cached responses are filled in first and only the misses are passed to `func`,
+    in a single call. Entries are shared with memoize_payload helpers of the same namespace.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(payloads, bypass_cache: bool = None):
+            payloads = list(payloads)
+            cache = None if bypass_cache else get_cache()
+            keys = [
+                make_payload_key(namespace, payload)
+                if cache is not None and not (bypass_cache is None and _is_non_deterministic(payload)) else None
+                for payload in payloads
+            ]
+            results = [cache.get(key) if key is not None else None for key in keys]
+            missing = [i for i, result in enumerate(results) if result is None]
+            if missing:
+                for i, response in zip(missing, func([payloads[i] for i in missing])):
+                    results[i] = response
+                    if response is not None and keys[i] is not None:
+                        cache.set(keys[i], response)
+            return results
+        return wrapper
+    return decorator
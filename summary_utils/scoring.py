@@ -0,0 +1,63 @@
+# summary_utils/scoring.py
+import numpy as np
+
+
+def normalize_rows(matrix):
+    """L2-normalize every row in one pass. All-zero rows stay zero instead of becoming NaN."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def centroid_scores(embeddings):
+    """
+    Cosine similarity of every sentence to the document centroid.
+    Returns (scores, normalized) so callers can reuse the normalized matrix.
+    """
+    normalized = normalize_rows(embeddings)
+    centroid = normalize_rows(np.asarray(embeddings, dtype=np.float32).mean(axis=0, keepdims=True))[0]
+    return normalized @ centroid, normalized
+
+
+def top_k(scores, k: int):
+    """Indices of the k highest scores, best first. O(n) selection with argpartition, then a sort of k items."""
+    n = len(scores)
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def mmr_select(normalized, scores, k: int, diversity: float = 0.3, pool_factor: int = 10):
+    """
+    Maximal marginal relevance over the centroid scores.
+
+    Each pick maximizes (1 - diversity) * relevance - diversity * (max similarity to what is already picked).
+    Only the top `k * pool_factor` sentences by relevance are considered, so the pairwise similarity
+    matrix stays small even for documents with thousands of sentences.
+    """
+    pool = top_k(scores, k * pool_factor)
+    if len(pool) <= 1:
+        return pool[:k]
+
+    similarity = normalized[pool] @ normalized[pool].T
+    relevance = scores[pool]
+    selected = [0]  # the pool is sorted, so position 0 is the most relevant sentence
+    max_sim = similarity[0].copy()
+    chosen = np.zeros(len(pool), dtype=bool)
+    chosen[0] = True
+
+    while len(selected) < min(k, len(pool)):
+        mmr = (1.0 - diversity) * relevance - diversity * max_sim
+        mmr[chosen] = -np.inf
+        best = int(np.argmax(mmr))
+        selected.append(best)
+        chosen[best] = True
+        np.maximum(max_sim, similarity[best], out=max_sim)
+
+    return pool[selected]
@@ -0,0 +1,33 @@
+# summary_utils/settings.py
+import os
+import logging
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+
+def get_setting(name: str, default):
+    """
+    Read a tuning setting for the summarization pipeline.
+    Looks in st.secrets['summaread'][name] first, then the SUMMAREAD_<NAME> environment variable,
+    and finally falls back to `default`. The value is cast to the type of `default` when possible.
+    """
+    value = None
+    try:
+        value = st.secrets["summaread"][name]
+    except Exception:
+        value = os.environ.get(f"SUMMAREAD_{name.upper()}")
+
+    if value is None:
+        return default
+    if default is None or isinstance(value, type(default)):
+        return value
+
+    try:
+        if isinstance(default, bool):
+            return str(value).strip().lower() in ("1", "true", "yes", "on")
+        return type(default)(value)
+    except (TypeError, ValueError):
+        logger.warning("Invalid value %r for setting %s, using default %r", value, name, default)
+        return default
@@ -0,0 +1,77 @@
+# summary_utils/stages.py
+import time
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+
+def _timed(func, args):
+    """Run func(*args) and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _notify(on_stage_done, name, future, fallback):
+    """Report one finished stage to the callback, using the fallback if it failed."""
+    try:
+        value = fallback if future.cancelled() or future.exception() else future.result()[0]
+        on_stage_done(name, value)
+    except Exception as e:
+        logger.error("Stage callback for %s failed: %s", name, e)
+
+
+def run_stages_in_parallel(stages: dict, fallbacks: dict = None, deadline: float = None, on_stage_done=None):
+    """
+    Start every stage at once and collect the results under one shared deadline.
+
+    Args:
+        stages: mapping of stage name -> (callable, args tuple).
+        fallbacks: mapping of stage name -> value used when that stage fails or misses the deadline.
+        deadline: seconds from now that all stages share. None waits for every stage.
+        on_stage_done: optional callback(name, result) called from the worker thread as soon as a
+            stage finishes (with its fallback if it failed), and for stages that miss the deadline.
+            A stage that finishes after its deadline may still be reported late.
+
+    Returns:
+        A tuple (results, timings). `timings` holds the wall-clock seconds per stage, or None
+        for stages that failed or missed the deadline (their result is the fallback).
+    """
+    fallbacks = fallbacks or {}
+    results, timings = {}, {}
+    if not stages:
+        return results, timings
+
+    executor = ThreadPoolExecutor(max_workers=len(stages), thread_name_prefix="stage")
+    futures = {
+        executor.submit(contextvars.copy_context().run, _timed, func, args): name
+        for name, (func, args) in stages.items()
+    }
+    if on_stage_done is not None:
+        for future, name in futures.items():
+            future.add_done_callback(
+                lambda f, name=name: _notify(on_stage_done, name, f, fallbacks.get(name))
+            )
+    done, not_done = wait(futures, timeout=deadline)
+
+    for future in done:
+        name = futures[future]
+        try:
+            results[name], timings[name] = future.result()
+        except Exception as e:
+            logger.error("Stage %s failed: %s", name, e)
+            results[name], timings[name] = fallbacks.get(name), None
+
+    for future in not_done:
+        name = futures[future]
+        logger.warning("Stage %s did not finish within %.1fs", name, deadline)
+        future.cancel()
+        results[name], timings[name] = fallbacks.get(name), None
+        if on_stage_done is not None:
+            on_stage_done(name, results[name])
+
+    # Don't block on stragglers; their threads finish in the background and are discarded.
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results, timings
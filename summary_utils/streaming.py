@@ -0,0 +1,72 @@
+# summary_utils/streaming.py
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def iter_sse_data(lines):
+    """
+    Yield the `data` payload of each server-sent event from an iterable of decoded lines.
+    Multi-line data fields are joined with newlines; comments and other fields are ignored.
+    """
+    data = []
+    for line in lines:
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+            continue
+        if line.startswith(":"):
+            continue
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+    if data:
+        yield "\n".join(data)
+
+
+def iter_chat_deltas(response):
+    """Yield the content deltas of a streamed (`"stream": true`) OpenAI-style chat completion response."""
+    # SSE is always UTF-8; chunk_size=None hands over each chunk as it arrives instead of waiting for 512 bytes
+    response.encoding = "utf-8"
+    for data in iter_sse_data(response.iter_lines(chunk_size=None, decode_unicode=True)):
+        if data.strip() == "[DONE]":
+            return
+        try:
+            chunk = json.loads(data)
+        except ValueError:
+            logger.warning("Skipping malformed stream chunk: %.80r", data)
+            continue
+        for choice in chunk.get("choices") or []:
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+class TokenStream:
+    """
+    Thread-safe text buffer between a producer (a pipeline stage reading a streamed completion)
+    and any number of readers on Streamlit reruns. Readers replay from the start, so a page that
+    reruns mid-stream still shows everything received so far.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def put(self, delta: str):
+        with self._lock:
+            self._parts.append(delta)
+
+    def close(self):
+        """Mark the stream finished. Safe to call more than once."""
+        with self._lock:
+            self._closed = True
+
+    @property
+    def text(self) -> str:
+        with self._lock:
+            return "".join(self._parts)
@@ -0,0 +1,166 @@
+# summary_utils/summarizer_backends.py
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future
+
+from summary_utils.chunk_engine import map_in_order
+
+logger = logging.getLogger(__name__)
+
+
+# Every backend exposes summarize_many(texts, max_length, min_length) -> list of summary strings,
+# in input order, with None for texts that could not be summarized.
+
+class RemoteBartBackend:
+    """
+    facebook/bart-large-cnn through the Hugging Face router. Texts go one request each on the chunk
+    pool, or all at once through `query_many_fn(payloads)` (the async client) when it is given.
+    """
+
+    name = "remote"
+
+    def __init__(self, query_fn, max_workers: int = 4, max_retries: int = 2, query_many_fn=None):
+        self._query_fn = query_fn
+        self._query_many_fn = query_many_fn
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+
+    @staticmethod
+    def _payload(text, max_length, min_length):
+        return {
+            "inputs": text,
+            "parameters": {
+                "max_length": max_length,
+                "min_length": min_length,
+                "do_sample": False
+            }
+        }
+
+    @staticmethod
+    def _summary_text(result):
+        if result and len(result) > 0 and 'summary_text' in result[0]:
+            return result[0]['summary_text']
+        return None
+
+    def _summarize_one(self, text, max_length, min_length):
+        return self._summary_text(self._query_fn(self._payload(text, max_length, min_length)))
+
+    def summarize_many(self, texts, max_length, min_length):
+        if self._query_many_fn is not None:
+            results = self._query_many_fn([self._payload(text, max_length, min_length) for text in texts])
+            return [self._summary_text(result) for result in results]
+        return map_in_order(
+            lambda text: self._summarize_one(text, max_length, min_length),
+            texts,
+            max_workers=self.max_workers,
+            max_retries=self.max_retries,
+        )
+
+
+class DynamicBatcher:
+    """
+    Collects summarization requests from every session and runs them together.
+
+    A worker thread takes the first waiting request, keeps gathering for up to `max_wait` seconds
+    (or until `max_batch_size` requests), groups them by generation parameters, sorts each group by
+    length so padding is minimal, and hands each slice to `batch_fn(texts, max_length, min_length)`.
+    """
+
+    def __init__(self, batch_fn, max_batch_size: int = 8, max_wait: float = 0.05):
+        self._batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="bart-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, text, max_length, min_length) -> Future:
+        future = Future()
+        self._queue.put((text, max_length, min_length, future))
+        return future
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(pending) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return pending
+
+    def _run(self):
+        while True:
+            groups = {}
+            for text, max_length, min_length, future in self._collect():
+                groups.setdefault((max_length, min_length), []).append((text, future))
+
+            for (max_length, min_length), requests_ in groups.items():
+                requests_.sort(key=lambda r: len(r[0]))
+                for start in range(0, len(requests_), self.max_batch_size):
+                    batch = requests_[start:start + self.max_batch_size]
+                    try:
+                        summaries = self._batch_fn([text for text, _ in batch], max_length, min_length)
+                        for (_, future), summary in zip(batch, summaries):
+                            future.set_result(summary)
+                    except Exception as e:
+                        logger.error("Local BART batch of %d failed: %s", len(batch), e)
+                        for _, future in batch:
+                            future.set_exception(e)
+
+
+class LocalBartBackend:
+    """
+    bart-large-cnn (or a distilled variant such as sshleifer/distilbart-cnn-12-6) running on CPU.
+    All chunks of one recursion level go through the shared DynamicBatcher, so they are
+    summarized in padded `generate` calls together with whatever other sessions submitted.
+    """
+
+    name = "local"
+
+    def __init__(self, model_name: str = "facebook/bart-large-cnn", num_threads: int = 4,
+                 max_batch_size: int = 8, max_wait: float = 0.05, max_input_tokens: int = 1024):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+        self._torch = torch
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.max_input_tokens = max_input_tokens
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+        self.model.eval()
+        self._batcher = DynamicBatcher(self._generate, max_batch_size, max_wait)
+        logger.info("Loaded local summarization model %s (%d threads)", model_name, torch.get_num_threads())
+
+    def _generate(self, texts, max_length, min_length):
+        batch = self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=self.max_input_tokens,
+            padding=True,
+            return_tensors="pt",
+        )
+        with self._torch.inference_mode():
+            output_ids = self.model.generate(
+                **batch,
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+            )
+        return [s.strip() for s in self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)]
+
+    def summarize_many(self, texts, max_length, min_length):
+        futures = [self._batcher.submit(text, max_length, min_length) for text in texts]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result() or None)
+            except Exception:
+                results.append(None)
+        return results
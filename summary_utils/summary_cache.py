@@ -0,0 +1,228 @@
+# summary_utils/summary_cache.py
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def make_summary_key(cleaned_text: str, model_ids, target_length, prompt_version: str) -> str:
+    """Content-addressed key: a SHA-256 over the cleaned text and every parameter that shapes the summary."""
+    h = hashlib.sha256()
+    h.update(cleaned_text.encode("utf-8"))
+    params = {
+        "models": list(model_ids),
+        "target_length": list(target_length),
+        "prompt_version": prompt_version,
+    }
+    h.update(b"\0")
+    h.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+# --- Backends ---
+# Every backend implements get(key) -> value | None, set(key, value) and clear().
+# Values are JSON-serializable summary dicts.
+
+class MemoryBackend:
+    """In-process LRU store with a TTL. Shared by all sessions of this Streamlit process."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds and time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Hits on the SQLite backend keep their access times in memory and write them in batches of this
+# many (or with the next set), so a cache hit never costs a disk commit of its own
+ACCESS_FLUSH_BATCH = 64
+
+
+class SQLiteBackend:
+    """
+    On-disk store that survives restarts. LRU is tracked with a last_access column, written
+    lazily: with the next set() or once ACCESS_FLUSH_BATCH hits are pending. `table` lets other
+    caches (e.g. OCR results) keep their own table.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl_seconds: float = 7 * 24 * 3600,
+                 table: str = "summary_cache"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.table = table
+        self._accessed = {}  # key -> last access time not yet written
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_access ON {table}(last_access)")
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if self.ttl_seconds and now - stored_at > self.ttl_seconds:
+                self._accessed.pop(key, None)
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= ACCESS_FLUSH_BATCH:
+                self._flush_access_times()
+                self._conn.commit()
+        return json.loads(value)
+
+    def _flush_access_times(self):
+        # called with the lock held; the caller commits
+        if self._accessed:
+            self._conn.executemany(
+                f"UPDATE {self.table} SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def flush(self):
+        """Write pending access times (e.g. before shutdown)."""
+        with self._lock:
+            if self._accessed:
+                self._flush_access_times()
+                self._conn.commit()
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._accessed.pop(key, None)
+            # eviction below goes by last_access, so bring it up to date first
+            self._flush_access_times()
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            if self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE stored_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f" SELECT key FROM {self.table} ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+
+class FirestoreBackend:
+    """
+    Shared store on the app's Firestore database (see auth_utils.firebase_manager.get_firestore_db).
+    Firestore has no cheap LRU, so only the TTL is enforced here; expired docs are removed on read.
+    """
+
+    def __init__(self, db, collection: str = "summary_cache", ttl_seconds: float = 7 * 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._collection = db.collection(collection)
+
+    def get(self, key):
+        doc = self._collection.document(key).get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict() or {}
+        if self.ttl_seconds and time.time() - data.get("stored_at", 0) > self.ttl_seconds:
+            self._collection.document(key).delete()
+            return None
+        return json.loads(data["value"])
+
+    def set(self, key, value):
+        self._collection.document(key).set({"value": json.dumps(value), "stored_at": time.time()})
+
+    def clear(self):
+        for doc in self._collection.stream():
+            doc.reference.delete()
+
+
+# --- Cache front-end ---
+class SummaryCache:
+    """Thin front-end over a backend that counts hits, misses and backend errors."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            # A broken cache must never break summarization; treat it as a miss.
+            logger.warning("Summary cache read failed: %s", e)
+            value = None
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.warning("Summary cache write failed: %s", e)
+            with self._lock:
+                self.errors += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
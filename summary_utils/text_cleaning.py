@@ -0,0 +1,153 @@
+# summary_utils/text_cleaning.py
+import re
+
+# Paragraph = text between blank lines. Inside a paragraph all whitespace collapses to one space,
+# which is done with str.split/join (C speed) instead of a regex pass.
+_PARAGRAPH_BREAK_RE = re.compile(r'\n\s*\n')
+
+# Links and emails, anchored at the start of a word so each word is scanned at most once.
+# Only run when the text contains one of the markers in _has_links.
+_LINK_RE = re.compile(r'(?<![^\s(\[<"\'])(?:[Hh][Tt][Tt][Pp][Ss]?://\S+|[Ww][Ww][Ww]\.\S+|[^\s@]+@\S+)')
+_COPYRIGHT_RE = re.compile(r'©[ \t]*\d{4}[^\n]*|Copyright[ \t]*©?[^\n]*', flags=re.IGNORECASE)
+
+# Page numbers ("Page 3 of 10", "3 of 10", "- 3 -", stray numbers between spaces) and unsupported
+# characters in one pass. The leading lookahead lets the scanner skip ordinary letters and spaces
+# cheaply instead of trying every alternative at every position. It runs after whitespace is
+# collapsed, so words are one space apart and no pattern reaches across a paragraph break.
+_JUNK = r'[^\w\s.,;:?!\-\'()"`]'
+_NOISE_RE = re.compile(
+    rf'(?=[Pp\d\-]|{_JUNK})(?:'
+    r'\b[Pp]age \d+ of \d+\b|\b\d+ of \d+\b|(?<!\S)(?:- ?\d+ ?-|\d+)(?!\S)'
+    rf'|{_JUNK}+)'
+)
+# Paragraphs emptied by removals leave runs of breaks behind
+_EXTRA_BREAKS_RE = re.compile(r'\n{3,}')
+
+# Sentence ends: . ! ? followed by whitespace, or a paragraph break
+_SENTENCE_END_RE = re.compile(r'[.!?](\s+)|\n\n')
+# Gap between two whole words, for cutting a stream of pages inside a paragraph
+_WORD_GAP_RE = re.compile(r'(\S+)(\s+)(?=(\S+)\s)')
+_CUT_WINDOW_CHARS = 2048
+
+
+def _tidy(text: str) -> str:
+    """Collapse double spaces and spaces around paragraph breaks left behind by removals (C-level replaces)."""
+    while "  " in text:
+        text = text.replace("  ", " ")
+    if " \n" in text or "\n " in text:
+        text = text.replace(" \n", "\n").replace("\n ", "\n")
+    if "\n\n\n" in text:
+        text = _EXTRA_BREAKS_RE.sub("\n\n", text)
+    return text.strip()
+
+
+def _has_links(text: str) -> bool:
+    return "@" in text or "://" in text or "www." in text or "WWW." in text
+
+
+def _has_copyright(text: str) -> bool:
+    return "©" in text or "opyright" in text or "OPYRIGHT" in text
+
+
+def clean_text(raw_text: str) -> str:
+    """
+    Normalize whitespace (keeping paragraph breaks as a blank line), drop page numbers, URLs, emails,
+    copyright lines and unsupported characters.
+
+    One regex pass for page numbers and junk characters, plus one each for links and copyright
+    notices only when their markers occur; whitespace is handled with str.split/join.
+    """
+    text = raw_text
+    # copyright notices run to the end of their line, so remove them before lines are joined
+    if _has_copyright(text):
+        text = _COPYRIGHT_RE.sub("", text)
+    if _has_links(text):
+        text = _LINK_RE.sub("", text)
+    text = "\n\n".join(" ".join(paragraph.split()) for paragraph in _PARAGRAPH_BREAK_RE.split(text))
+    return _tidy(_NOISE_RE.sub("", text))
+
+
+def sentence_spans(cleaned_text: str):
+    """Yield (start, end) offsets of each sentence: split on . ! ? followed by whitespace, and on paragraph breaks."""
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(cleaned_text):
+        end = match.start(1) if match.group(1) else match.start()
+        yield from _trimmed_span(cleaned_text, start, end)
+        start = match.end()
+    yield from _trimmed_span(cleaned_text, start, len(cleaned_text))
+
+
+def _trimmed_span(text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        yield start, end
+
+
+def split_sentences(cleaned_text: str):
+    """Rule-based sentence split on . ! ? followed by whitespace, and on paragraph breaks."""
+    return [cleaned_text[start:end] for start, end in sentence_spans(cleaned_text)]
+
+
+def _stream_cut(text: str):
+    """
+    The last place `text` can be cut so that cleaning both sides apart gives the same result as
+    cleaning it whole: (head, rest, separator of the cleaned sides), or None.
+
+    Paragraph breaks are always safe, since every pattern stays inside one paragraph. Inside a
+    paragraph, a gap between two whole alphabetic words is safe (page-number patterns need digits
+    or dashes next to the gap) as long as both words survive cleaning: the word after the gap must
+    not start a "Page N of M" or copyright notice, and no notice may run over the word before it.
+    """
+    last_break = None
+    for last_break in _PARAGRAPH_BREAK_RE.finditer(text):
+        pass
+    if last_break is not None:
+        return text[:last_break.start()], text[last_break.end():], "\n\n"
+
+    offset = max(0, len(text) - _CUT_WINDOW_CHARS)
+    for match in reversed(list(_WORD_GAP_RE.finditer(text, offset))):
+        if match.start() == offset and offset:
+            continue  # the word may have been cut off by the window
+        if not (match.group(1).isalpha() and match.group(3).isalpha()) or match.group(3) in ("Page", "page"):
+            continue
+        start, end = match.span(2)
+        # a copyright notice runs to the end of its line; removing a whole line can also turn the
+        # breaks around it into a paragraph break
+        if match.group(3).lower().startswith("copyright") or _has_copyright(text[text.rfind("\n", 0, start) + 1:start]):
+            continue
+        return text[:start], text[end:], " "
+    return None
+
+
+def iter_clean_text(chunks):
+    """
+    Streaming variant of clean_text for page-by-page input (e.g. from the PDF extractor).
+
+    Each piece is cleaned up to the last point where cutting cannot change the result (a paragraph
+    break, or a gap between two plain words); the rest is carried into the next piece. Yields
+    cleaned pieces whose concatenation equals clean_text of the whole input.
+    """
+    carry = ""
+    emitted = False
+    separator = ""  # joins the next non-empty piece to what was emitted before
+
+    for chunk in chunks:
+        carry += chunk
+        cut = _stream_cut(carry)
+        if cut is None:
+            continue
+        head, carry, head_separator = cut
+        body = clean_text(head)
+        if body:
+            yield (separator if emitted else "") + body
+            emitted = True
+            separator = head_separator
+        elif head_separator == "\n\n":
+            separator = "\n\n"
+
+    body = clean_text(carry)
+    if body:
+        yield (separator if emitted else "") + body
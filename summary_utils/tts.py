@@ -0,0 +1,305 @@
+# summary_utils/tts.py
+import io
+import re
+import math
+import wave
+import zlib
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends, and line breaks (outline points are one per line and often have no full stop)
+_SEGMENT_BREAK_RE = re.compile(r'(?<=[.!?])\s+|\s*\n\s*')
+
+
+def split_for_speech(text: str, max_chars: int = 500, first_max_chars: int = 150):
+    """
+    Split text into speech segments at sentence boundaries, packing whole sentences up to
+    `max_chars`. The first segment is kept short (`first_max_chars`) so playback can start early.
+    A single sentence longer than the limit becomes a segment of its own.
+    """
+    segments, current = [], ""
+    for sentence in _SEGMENT_BREAK_RE.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        limit = first_max_chars if not segments else max_chars
+        if current and len(current) + 1 + len(sentence) > limit:
+            segments.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        segments.append(current)
+    return segments
+
+
+# --- Engines: synthesize(text, tld) -> audio bytes in `audio_format` ---
+
+AUDIO_MIME_TYPES = {"mp3": "audio/mpeg", "wav": "audio/wav"}
+
+class GTTSEngine:
+    """Google Translate TTS (network). Returns MP3; MP3 segments can be joined by concatenation."""
+
+    name = "gtts"
+    audio_format = "mp3"
+    max_workers = None  # no limit beyond the synthesizer's pool
+
+    def __init__(self, lang: str = "en"):
+        self.lang = lang
+
+    def synthesize(self, text: str, tld: str) -> bytes:
+        from gtts import gTTS
+
+        audio = io.BytesIO()
+        gTTS(text=text, lang=self.lang, tld=tld).write_to_fp(audio)
+        return audio.getvalue()
+
+
+class Pyttsx3Engine:
+    """
+    Offline speech through pyttsx3 (the platform's speech engine, e.g. eSpeak). Returns WAV.
+    The accent `tld` is ignored. pyttsx3 is not thread-safe, so segments are rendered one at a time.
+    """
+
+    name = "pyttsx3"
+    audio_format = "wav"
+    max_workers = 1
+
+    def __init__(self, rate: int = None):
+        self.rate = rate
+        self._lock = threading.Lock()
+
+    def synthesize(self, text: str, tld: str) -> bytes:
+        import pyttsx3
+
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            with self._lock:
+                engine = pyttsx3.init()
+                if self.rate:
+                    engine.setProperty("rate", self.rate)
+                engine.save_to_file(text, path)
+                engine.runAndWait()
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+
+class ToneEngine:
+    """
+    Deterministic in-process engine for tests and offline development: a sine tone per word as
+    16-bit mono WAV, so output length follows the text. The accent `tld` only shifts the pitch.
+    """
+
+    name = "tone"
+    audio_format = "wav"
+    max_workers = None
+
+    def __init__(self, sample_rate: int = 8000, word_seconds: float = 0.05):
+        self.sample_rate = sample_rate
+        self.word_seconds = word_seconds
+
+    def synthesize(self, text: str, tld: str) -> bytes:
+        frequency = 440 + zlib.crc32(tld.encode("utf-8")) % 220
+        frames = int(self.sample_rate * self.word_seconds) * max(1, len(text.split()))
+        step = 2 * math.pi * frequency / self.sample_rate
+        samples = array("h", (int(8000 * math.sin(step * i)) for i in range(frames)))
+        if sys.byteorder == "big":
+            samples.byteswap()  # WAV samples are little-endian
+        out = io.BytesIO()
+        with wave.open(out, "wb") as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(self.sample_rate)
+            writer.writeframes(samples.tobytes())
+        return out.getvalue()
+
+
+ENGINES = {
+    "gtts": GTTSEngine,
+    "pyttsx3": Pyttsx3Engine,
+    "tone": ToneEngine,
+}
+
+
+def get_engine(name: str, **kwargs):
+    try:
+        return ENGINES[name](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown TTS engine {name!r}; expected one of {sorted(ENGINES)}")
+
+
+def join_audio(segments, audio_format: str) -> bytes:
+    """Join audio segments into one track. MP3 frames concatenate; WAV needs one header."""
+    if audio_format != "wav" or len(segments) < 2:
+        return b"".join(segments)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as writer:
+        for index, segment in enumerate(segments):
+            with wave.open(io.BytesIO(segment), "rb") as reader:
+                if index == 0:
+                    writer.setparams(reader.getparams())
+                writer.writeframes(reader.readframes(reader.getnframes()))
+    return out.getvalue()
+
+
+# Layer III bitrates (kbit/s) by bitrate index, for MPEG-1 and for MPEG-2 / 2.5
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+def audio_duration(audio: bytes, audio_format: str):
+    """Length of `audio` in seconds, or None if it can't be told (MP3 is assumed constant bitrate)."""
+    try:
+        if audio_format == "wav":
+            with wave.open(io.BytesIO(audio), "rb") as reader:
+                return reader.getnframes() / reader.getframerate()
+        start = 0
+        if audio[:3] == b"ID3":  # skip an ID3v2 tag; its size is stored 7 bits per byte
+            size = audio[6] << 21 | audio[7] << 14 | audio[8] << 7 | audio[9]
+            start = 10 + size
+        sync = audio.find(b"\xff", start)
+        while sync != -1 and sync + 2 < len(audio) and (audio[sync + 1] & 0xE0) != 0xE0:
+            sync = audio.find(b"\xff", sync + 1)
+        if sync == -1 or sync + 2 >= len(audio):
+            return None
+        version = 1 if (audio[sync + 1] >> 3) & 0x3 == 0x3 else 2
+        bitrate = _MP3_BITRATES[version][audio[sync + 2] >> 4 & 0xF] if audio[sync + 2] >> 4 != 0xF else 0
+        return (len(audio) - sync) * 8 / (bitrate * 1000) if bitrate else None
+    except (wave.Error, EOFError, IndexError):
+        return None
+
+
+class AudioCache:
+    """Byte-bounded LRU of synthesized audio, keyed by (engine, text hash, tld)."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(engine_name: str, text: str, tld: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{engine_name}:{tld}:{digest}"
+
+    def get(self, key):
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def set(self, key, audio: bytes):
+        if len(audio) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= len(previous)
+            self._entries[key] = audio
+            self.current_bytes += len(audio)
+            while self.current_bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self.current_bytes -= len(old)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class SpeechSynthesizer:
+    """
+    Text-to-speech in parallel segments.
+
+    Text is split at sentence boundaries and the segments are synthesized concurrently;
+    iter_segments() yields them in order, so the first one can start playing while the rest
+    render. Segments and whole tracks are cached, so listening again (or switching back to an
+    accent) does not call the engine.
+    """
+
+    def __init__(self, engine, cache: AudioCache = None, max_workers: int = 4,
+                 segment_chars: int = 500, first_segment_chars: int = 150):
+        self.engine = engine
+        self.cache = cache
+        self.max_workers = min(max_workers, engine.max_workers or max_workers)
+        self.segment_chars = segment_chars
+        self.first_segment_chars = first_segment_chars
+
+    @property
+    def audio_format(self) -> str:
+        return self.engine.audio_format
+
+    def _key(self, text: str, tld: str) -> str:
+        return AudioCache.make_key(self.engine.name, text, tld)
+
+    def _synthesize_segment(self, text: str, tld: str) -> bytes:
+        key = self._key(text, tld)
+        audio = self.cache.get(key) if self.cache is not None else None
+        if audio is None:
+            audio = self.engine.synthesize(text, tld)
+            if self.cache is not None:
+                self.cache.set(key, audio)
+        return audio
+
+    def cached(self, text: str, tld: str):
+        """The whole track for `text` if it is cached, else None."""
+        return self.cache.get(self._key(text, tld)) if self.cache is not None else None
+
+    def iter_segments(self, text: str, tld: str):
+        """Yield each segment's audio in order as soon as it (and those before it) are ready."""
+        segments = split_for_speech(text, self.segment_chars, self.first_segment_chars)
+        if not segments:
+            return
+        workers = max(1, min(self.max_workers, len(segments)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts") as executor:
+            futures = [executor.submit(self._synthesize_segment, segment, tld) for segment in segments]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def synthesize(self, text: str, tld: str, on_first_segment=None) -> bytes:
+        """
+        The whole track for `text`. `on_first_segment(audio)` is called with the first segment as
+        soon as it is ready (not at all on a whole-track cache hit).
+        """
+        audio = self.cached(text, tld)
+        if audio is not None:
+            return audio
+        parts = []
+        for audio in self.iter_segments(text, tld):
+            if not parts and on_first_segment is not None:
+                on_first_segment(audio)
+            parts.append(audio)
+        audio = join_audio(parts, self.audio_format)
+        if self.cache is not None:
+            self.cache.set(self._key(text, tld), audio)
+        return audio
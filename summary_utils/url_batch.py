@@ -0,0 +1,75 @@
+# summary_utils/url_batch.py
+import contextvars
+from collections import deque, OrderedDict
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+def normalize_url(url: str) -> str:
+    """Strip whitespace and default to https:// when no scheme is given."""
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')) and not url.startswith('file://'):
+        url = 'https://' + url
+    return url
+
+
+def parse_url_list(text: str):
+    """URLs from free text, one per line (commas and spaces also separate). Duplicates are dropped."""
+    seen = OrderedDict()
+    for token in text.replace(',', ' ').split():
+        seen.setdefault(normalize_url(token), None)
+    return list(seen)
+
+
+def iter_fetch_concurrently(urls, fetch, max_workers: int = 8, per_host: int = 2):
+    """
+    Call `fetch(url)` for every URL on a bounded thread pool and yield (index, url, result)
+    in completion order, so callers can show each page as soon as it arrives.
+
+    At most `per_host` requests run against the same host at once; URLs for busy hosts wait
+    while other hosts' URLs go ahead, so a reading list dominated by one site stays polite
+    without stalling the rest. An exception from `fetch` is yielded as the result.
+    """
+    urls = list(urls)
+    if not urls:
+        return
+
+    queues = OrderedDict()  # host -> deque of (index, url) not yet started
+    for index, url in enumerate(urls):
+        queues.setdefault(urlsplit(url).hostname or url, deque()).append((index, url))
+    in_flight = {host: 0 for host in queues}
+
+    def next_ready():
+        # round-robin over hosts that still have capacity
+        for host, queue in queues.items():
+            if queue and in_flight[host] < per_host:
+                queues.move_to_end(host)
+                return host, queue.popleft()
+        return None
+
+    workers = max(1, min(max_workers, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as executor:
+        running = {}
+
+        def fill():
+            while len(running) < workers:
+                ready = next_ready()
+                if ready is None:
+                    return
+                host, (index, url) = ready
+                in_flight[host] += 1
+                future = executor.submit(contextvars.copy_context().run, fetch, url)
+                running[future] = (host, index, url)
+
+        fill()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                host, index, url = running.pop(future)
+                in_flight[host] -= 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                yield index, url, result
+            fill()
@@ -0,0 +1,257 @@
+# summary_utils/web_extraction.py
+import re
+import logging
+from collections import defaultdict
+
+from bs4 import BeautifulSoup, NavigableString
+
+logger = logging.getLogger(__name__)
+
+# selectolax is optional; 1.0 dropped the old `parser` module for lexbor
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+# Subtrees that never hold article text
+SKIP_TAGS = {
+    'script', 'style', 'nav', 'footer', 'iframe', 'noscript', 'head', 'header', 'aside', 'form',
+    'button', 'select', 'textarea', 'svg', 'canvas', 'template', 'object', 'embed',
+}
+# Elements whose own text forms a separate block; nested blocks keep their text to themselves
+BLOCK_TAGS = {
+    'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'blockquote', 'pre', 'dd', 'dt', 'figcaption',
+    'td', 'th', 'caption', 'div', 'section', 'article', 'main', 'body', 'html', 'ul', 'ol', 'dl',
+    'table', 'tr', 'figure',
+}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+# Never dropped for looking like chrome, whatever their class says
+KEEP_TAGS = {'html', 'body', 'article', 'main'}
+
+# class/id hints, after Readability
+UNLIKELY_RE = re.compile(
+    r"comment|sidebar|footer|\bnav|menu|share|social|related|promo|advert|\bads?\b|cookie|banner|"
+    r"subscribe|newsletter|breadcrumb|popup|modal|disqus|sponsor|masthead|pagination",
+    re.IGNORECASE,
+)
+POSITIVE_RE = re.compile(r"article|content|main|body|post|entry|story|text|blog", re.IGNORECASE)
+
+MIN_SCORED_CHARS = 25       # shorter blocks do not vote for their container
+MIN_KEPT_CHARS = 20         # shorter non-heading blocks are kept only if they end a sentence
+MAX_LINK_DENSITY = 0.5      # blocks (and containers) that are mostly link text are navigation
+SIBLING_SCORE_RATIO = 0.2   # siblings of the best container scoring at least this much are kept too
+
+START, TEXT, END = 0, 1, 2
+
+# Bump whenever extraction changes so cached page text is re-extracted from the cached HTML
+EXTRACTOR_VERSION = "2"
+
+
+# --- Backends: each yields (START, tag, "class id"), (TEXT, text) and (END, tag) in document order ---
+
+def _events_lexbor(html: str):
+    root = HTMLParser(html).root
+    if root is None:
+        return
+    stack = [iter([root])]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            if stack:
+                yield END, None
+            continue
+        tag = node.tag
+        if tag == '-text':
+            yield TEXT, node.text_content or ''
+        elif not tag.startswith('-'):
+            attrs = node.attributes
+            yield START, tag, f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+            stack.append(node.iter(include_text=True))
+
+
+def _events_lxml(html: str):
+    parser = lxml_html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+    try:
+        root = lxml_html.fromstring(html.encode('utf-8'), parser=parser)
+    except (etree.ParserError, ValueError):
+        return
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        if event == 'start':
+            yield START, element.tag, f"{element.get('class', '')} {element.get('id', '')}"
+            if element.text:
+                yield TEXT, element.text
+        else:
+            yield END, element.tag
+            if element.tail:
+                yield TEXT, element.tail
+
+
+def _events_bs4(html: str):
+    soup = BeautifulSoup(html, 'html.parser')
+    stack = [iter(soup.contents)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            if stack:
+                yield END, None
+            continue
+        if isinstance(node, NavigableString):
+            if type(node) is NavigableString:  # skip comments, doctypes, CDATA
+                yield TEXT, str(node)
+        else:
+            yield START, node.name, f"{' '.join(node.get('class') or [])} {node.get('id') or ''}"
+            stack.append(iter(node.contents))
+
+
+def _iter_events(html: str):
+    # lxml's iterwalk is the fastest way to stream a tree; selectolax parses fast but its node
+    # objects are slower to walk from Python
+    if lxml_html is not None:
+        return _events_lxml(html)
+    if HTMLParser is not None:
+        return _events_lexbor(html)
+    return _events_bs4(html)
+
+
+# --- Extraction ---
+
+def _collect_blocks(events):
+    """
+    One pass over the parse events. Returns (blocks, parents, weights, totals) where each block is
+    (element id, ancestor ids, tag, text, link chars) in document order and every text node belongs
+    to exactly one block (its nearest block-level ancestor), so nested elements never repeat text.
+    Text of a block element around a nested block becomes separate blocks before and after it.
+    """
+    blocks, parents, weights = [], {}, {}
+    totals = defaultdict(lambda: [0, 0])  # element id -> [text chars, link chars] of its blocks
+    stack = []  # open elements: (id, tag, buffer) where buffer = [text parts, link chars] or None
+    skip_depth = link_depth = 0
+    next_id = 0
+
+    def flush(depth):
+        # turn the text gathered so far by the block at stack[depth] into a block
+        element_id, tag, buffer = stack[depth]
+        text = ' '.join(' '.join(buffer[0]).split())
+        link_chars = min(buffer[1], len(text))
+        buffer[0], buffer[1] = [], 0
+        if text:
+            ancestors = tuple(entry[0] for entry in stack[:depth])
+            blocks.append((element_id, ancestors, tag, text, link_chars))
+            for owner in ancestors + (element_id,):
+                totals[owner][0] += len(text)
+                totals[owner][1] += link_chars
+
+    for event in events:
+        kind = event[0]
+        if skip_depth:
+            if kind == START:
+                skip_depth += 1
+            elif kind == END:
+                skip_depth -= 1
+            continue
+
+        if kind == START:
+            tag, attrs = event[1], event[2]
+            unlikely = UNLIKELY_RE.search(attrs) and not POSITIVE_RE.search(attrs)
+            if tag in SKIP_TAGS or (unlikely and tag not in KEEP_TAGS):
+                skip_depth = 1
+                continue
+            if tag in BLOCK_TAGS:
+                # the enclosing block's text so far comes before this block's
+                for depth in range(len(stack) - 1, -1, -1):
+                    if stack[depth][2] is not None:
+                        flush(depth)
+                        break
+            element_id, next_id = next_id, next_id + 1
+            parents[element_id] = stack[-1][0] if stack else None
+            weights[element_id] = 25 if POSITIVE_RE.search(attrs) else (-25 if UNLIKELY_RE.search(attrs) else 0)
+            stack.append((element_id, tag, [[], 0] if tag in BLOCK_TAGS else None))
+            if tag == 'a':
+                link_depth += 1
+
+        elif kind == END:
+            if stack[-1][2] is not None:
+                flush(len(stack) - 1)
+            element_id, tag, _ = stack.pop()
+            if tag == 'a':
+                link_depth -= 1
+
+        else:
+            text = event[1]
+            for _, _, buffer in reversed(stack):
+                if buffer is not None:
+                    buffer[0].append(text)
+                    if link_depth:
+                        buffer[1] += len(text.strip())
+                    break
+
+    return blocks, parents, weights, totals
+
+
+def _link_density(text_chars, link_chars):
+    return link_chars / text_chars if text_chars else 1.0
+
+
+def _select_containers(blocks, parents, weights, totals):
+    """Readability-style scoring: paragraphs vote for their parent (and half for the grandparent)."""
+    scores = defaultdict(float)
+    for _, ancestors, tag, text, link_chars in blocks:
+        if tag in HEADING_TAGS or len(text) < MIN_SCORED_CHARS or _link_density(len(text), link_chars) > MAX_LINK_DENSITY:
+            continue
+        score = 1 + text.count(',') + min(len(text) // 100, 3)
+        if ancestors:
+            scores[ancestors[-1]] += score
+        if len(ancestors) > 1:
+            scores[ancestors[-2]] += score / 2
+    if not scores:
+        return None
+
+    final = {
+        element_id: (score + weights[element_id]) * (1 - _link_density(*totals[element_id]))
+        for element_id, score in scores.items()
+    }
+    best = max(final, key=final.get)
+    threshold = max(10.0, final[best] * SIBLING_SCORE_RATIO)
+    return {best} | {
+        element_id for element_id, score in final.items()
+        if parents[element_id] == parents[best] and score >= threshold
+    }
+
+
+def extract_main_text(html: str) -> str:
+    """
+    Main article text of an HTML page as paragraphs separated by blank lines.
+
+    Walks the parsed page once, giving every piece of text to exactly one block so nested
+    elements (an <article> and its <p> children) are not repeated. Blocks are scored by length,
+    commas and link density; the best-scoring container (plus strong siblings) is kept, minus
+    link-heavy blocks such as navigation lists, short fragments and exact duplicates.
+    Parses with lxml, or selectolax, falling back to the pure-Python html.parser.
+    """
+    blocks, parents, weights, totals = _collect_blocks(_iter_events(html))
+    selected = _select_containers(blocks, parents, weights, totals)
+
+    seen, paragraphs = set(), []
+    for element_id, ancestors, tag, text, link_chars in blocks:
+        if selected is not None and element_id not in selected and selected.isdisjoint(ancestors):
+            continue
+        if _link_density(len(text), link_chars) > MAX_LINK_DENSITY:
+            continue
+        if tag not in HEADING_TAGS and len(text) < MIN_KEPT_CHARS and not text.endswith(('.', '!', '?', '"', "'")):
+            continue
+        if text in seen:
+            continue
+        seen.add(text)
+        paragraphs.append(text)
+    return '\n\n'.join(paragraphs)
@@ -0,0 +1,41 @@
+import re
+
+from summary_utils.chunker import TokenChunker, sentence_starts
+from summary_utils.document_model import Document
+
+TEXT = (
+    "Results were mixed across sites\n\n"
+    "The first trial ran for a year. Did the second one? It stopped early!\n"
+    "A final paragraph closes the report. It has two sentences."
+)
+
+
+class WordTokenizer:
+    """Fast-tokenizer stand-in: one token per word, with offsets."""
+
+    is_fast = True
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+    def __call__(self, text, **kwargs):
+        return {"offset_mapping": [m.span() for m in re.finditer(r"\S+", text)]}
+
+
+def test_sentence_starts_match_the_document_model():
+    # a paragraph break ends a sentence even without . ! or ?
+    assert sentence_starts(TEXT) == list(Document(TEXT).sentence_starts)
+    assert TEXT[sentence_starts(TEXT)[1]:].startswith("The first trial")
+
+
+def test_chunks_end_on_sentence_boundaries_by_default():
+    chunker = TokenChunker(WordTokenizer())
+    encoded = chunker.encode(TEXT)
+
+    chunks = chunker.chunk(encoded, chunk_size=8, overlap=2)
+
+    assert encoded.token_count == len(encoded) + 2
+    # the heading ends at a paragraph break, not at punctuation
+    assert chunks[0] == ("Results were mixed across sites", 5)
+    assert chunks[2] == ("for a year. Did the second one?", 7)
+    assert chunks[-1][0].endswith("two sentences.")
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+import requests
+
+from summary_utils.fetch_cache import FetchCache, fetch_text
+
+PAGE = b"<html><body><p>Cached page text.</p></body></html>"
+
+
+def _get(url, headers):
+    return requests.get(url, headers=headers, timeout=5)
+
+
+class CountingExtractor:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, html):
+        self.calls += 1
+        return html.upper()
+
+
+@pytest.fixture
+def etag_server(stub_server):
+    def respond(method, path, headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        return 200, {"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"}, PAGE
+    stub_server.respond = respond
+    return stub_server
+
+
+def test_fresh_entry_is_served_without_a_request(tmp_path, etag_server):
+    cache = FetchCache(str(tmp_path / "fetch.sqlite3"), ttl_seconds=3600)
+    extract = CountingExtractor()
+    url = etag_server.url("/article")
+
+    first = fetch_text(url, _get, extract, "1", cache)
+    second = fetch_text(url, _get, extract, "1", cache)
+
+    assert first == second == PAGE.decode().upper()
+    assert len(etag_server.requests) == 1
+    assert extract.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_stale_entry_is_revalidated_with_etag(tmp_path, etag_server):
+    cache = FetchCache(str(tmp_path / "fetch.sqlite3"), ttl_seconds=0.2)
+    extract = CountingExtractor()
+    url = etag_server.url("/article")
+
+    fetch_text(url, _get, extract, "1", cache)
+    time.sleep(0.3)
+    text = fetch_text(url, _get, extract, "1", cache)
+
+    assert text == PAGE.decode().upper()
+    assert len(etag_server.requests) == 2
+    assert etag_server.requests[1][2].get("If-None-Match") == '"v1"'
+    assert extract.calls == 1  # a 304 reuses the cached text without parsing again
+    assert cache.stats()["revalidated"] == 1
+
+    # the 304 made the entry fresh again
+    fetch_text(url, _get, extract, "1", cache)
+    assert len(etag_server.requests) == 2
+
+
+def test_new_extractor_version_re_extracts_the_cached_body(tmp_path, etag_server):
+    cache = FetchCache(str(tmp_path / "fetch.sqlite3"), ttl_seconds=3600)
+    extract = CountingExtractor()
+    url = etag_server.url("/article")
+
+    fetch_text(url, _get, extract, "1", cache)
+    fetch_text(url, _get, extract, "2", cache)
+    fetch_text(url, _get, extract, "2", cache)
+
+    assert len(etag_server.requests) == 1
+    assert extract.calls == 2
+
+
+def test_no_store_responses_are_not_cached(tmp_path, stub_server):
+    stub_server.respond = lambda method, path, headers: (200, {"Cache-Control": "no-store"}, PAGE)
+    cache = FetchCache(str(tmp_path / "fetch.sqlite3"), ttl_seconds=3600)
+    url = stub_server.url("/private")
+
+    fetch_text(url, _get, CountingExtractor(), "1", cache)
+    fetch_text(url, _get, CountingExtractor(), "1", cache)
+
+    assert len(stub_server.requests) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_http_errors_are_raised_and_not_cached(tmp_path, stub_server):
+    stub_server.respond = lambda method, path, headers: (404, {}, b"missing")
+    cache = FetchCache(str(tmp_path / "fetch.sqlite3"))
+
+    with pytest.raises(requests.HTTPError):
+        fetch_text(stub_server.url("/gone"), _get, CountingExtractor(), "1", cache)
+    assert cache.stats()["entries"] == 0
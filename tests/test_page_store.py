@@ -0,0 +1,47 @@
+import os
+import time
+
+from summary_utils.page_store import PageStore, document_preview
+
+
+def _write(store, pages):
+    with store.writer() as writer:
+        for page in pages:
+            writer.add_page(page)
+    return writer.doc_id
+
+
+def test_pages_round_trip(tmp_path):
+    store = PageStore(str(tmp_path))
+    doc_id = _write(store, ["first page ", "second page"])
+
+    assert list(store.iter_pages(doc_id)) == ["first page ", "second page"]
+    assert store.word_count(doc_id) == 4
+    assert document_preview(store, doc_id, "", 5) == "first\n\n[... preview truncated ...]"
+    assert document_preview(store, None, "in memory", 100) == "in memory"
+
+
+def test_writing_purges_expired_documents(tmp_path):
+    store = PageStore(str(tmp_path), max_age_seconds=60, purge_interval_seconds=0)
+    old = _write(store, ["left behind by an ended session"])
+    past = time.time() - 120
+    for name in os.listdir(tmp_path):
+        os.utime(tmp_path / name, (past, past))
+
+    new = _write(store, ["a fresh upload"])
+
+    assert not store.exists(old)
+    assert store.exists(new)
+
+
+def test_purging_is_throttled(tmp_path):
+    store = PageStore(str(tmp_path), max_age_seconds=60, purge_interval_seconds=3600)
+    _write(store, ["first write purges"])
+    old = _write(store, ["written before it expired"])
+    past = time.time() - 120
+    for name in os.listdir(tmp_path):
+        os.utime(tmp_path / name, (past, past))
+
+    _write(store, ["within the interval"])
+
+    assert store.exists(old)
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from summary_utils.async_client import AsyncModelClient
+from summary_utils.http_client import HttpClient, RateLimitTimeout
+from summary_utils.rate_limiter import RateLimiter, TokenBucket, session_scope
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock)
+
+    assert [bucket.try_take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_take() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_take() == 0.0
+
+
+def _client(limiter, queue_timeout=None):
+    return HttpClient(max_retries=0, rate_limiter=limiter, queue_timeout=queue_timeout)
+
+
+def test_sessions_are_served_round_robin(stub_server):
+    client = _client(RateLimiter({"chat": (10.0, 1)}))
+    url = stub_server.url("/chat")
+
+    def call(session_id):
+        with session_scope(session_id):
+            client.post(url, endpoint="chat", headers={"X-Session": session_id}).close()
+
+    busy = [threading.Thread(target=call, args=("busy",)) for _ in range(8)]
+    for thread in busy:
+        thread.start()
+    time.sleep(0.15)  # the busy session's requests are queued before the other one arrives
+    served_before = len(stub_server.requests)
+    other = threading.Thread(target=call, args=("other",))
+    other.start()
+    for thread in busy + [other]:
+        thread.join(5)
+
+    order = [headers.get("X-Session") for _, _, headers in stub_server.requests]
+    assert len(order) == 9
+    # the single request waits behind at most the grant in progress and one turn of the busy session
+    assert order.index("other") <= served_before + 2
+    assert order.index("other") < len(order) - 3
+
+
+def test_async_client_serves_sessions_round_robin(stub_server):
+    stub_server.respond = lambda method, path, headers: (200, {"Content-Type": "application/json"}, b"{}")
+    client = AsyncModelClient(
+        {"chat": (stub_server.url("/chat"), {})},
+        concurrency={"chat": 4},
+        max_retries=0,
+        rate_limiter=RateLimiter({"chat": (10.0, 1)}),
+    )
+
+    async def scenario():
+        threads_before = threading.active_count()
+        busy = [asyncio.create_task(client.query("chat", {"session": "busy"}, "busy")) for _ in range(12)]
+        await asyncio.sleep(0.15)  # the busy session's requests are queued before the other one arrives
+        served_before = len(stub_server.bodies)
+        # queued requests wait on the event loop, not on a thread each
+        waiting_threads = threading.active_count() - threads_before
+        other = asyncio.create_task(client.query("chat", {"session": "other"}, "other"))
+        results = await asyncio.gather(*busy, other)
+        await client.close()
+        return served_before, waiting_threads, results
+
+    served_before, waiting_threads, results = asyncio.run(scenario())
+
+    assert results == [{}] * 13
+    assert waiting_threads <= 2
+    order = [json.loads(body)["session"] for body in stub_server.bodies]
+    assert order.index("other") <= served_before + 2
+    assert order.index("other") < len(order) - 3
+
+
+def test_queue_timeout_raises_without_sending(stub_server):
+    limiter = RateLimiter({"chat": (0.5, 1)})
+    client = _client(limiter, queue_timeout=0.1)
+    url = stub_server.url("/chat")
+
+    client.post(url, endpoint="chat").close()
+    start = time.monotonic()
+    with pytest.raises(RateLimitTimeout):
+        client.post(url, endpoint="chat")
+
+    assert time.monotonic() - start < 1.0
+    assert len(stub_server.requests) == 1
+    assert limiter.stats()["chat"]["timeouts"] == 1
+
+
+def test_endpoints_without_a_limit_are_not_queued(stub_server):
+    client = _client(RateLimiter({"chat": (0.5, 1)}), queue_timeout=0.1)
+    for _ in range(5):
+        client.get(stub_server.url("/page"), endpoint="fetch").close()
+    assert len(stub_server.requests) == 5
+
+
+def test_every_retry_takes_a_token(stub_server):
+    responses = iter([(503, {"Retry-After": "0"}, b""), (200, {}, b"ok")])
+    stub_server.respond = lambda method, path, headers: next(responses)
+    limiter = RateLimiter({"chat": (100.0, 5)})
+    client = HttpClient(max_retries=1, rate_limiter=limiter)
+
+    response = client.post(stub_server.url("/chat"), endpoint="chat")
+
+    assert response.status_code == 200
+    assert limiter.stats()["chat"]["granted"] == 2
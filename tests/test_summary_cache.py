@@ -0,0 +1,47 @@
+import sqlite3
+
+from summary_utils import summary_cache
+from summary_utils.summary_cache import SQLiteBackend
+
+
+def _last_access(path, table, key):
+    with sqlite3.connect(path) as conn:
+        return conn.execute(f"SELECT last_access FROM {table} WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_hits_batch_their_access_times(tmp_path, monkeypatch):
+    monkeypatch.setattr(summary_cache, "ACCESS_FLUSH_BATCH", 3)
+    path = str(tmp_path / "cache.sqlite3")
+    backend = SQLiteBackend(path)
+    for key in "abc":
+        backend.set(key, {"v": key})
+    stored = _last_access(path, "summary_cache", "a")
+
+    assert backend.get("a") == {"v": "a"}
+    assert backend.get("b") == {"v": "b"}
+    assert _last_access(path, "summary_cache", "a") == stored  # not written yet
+
+    backend.get("c")
+    assert _last_access(path, "summary_cache", "a") > stored
+
+def test_pending_access_times_decide_eviction(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")  # "b" is now the least recently used, though nothing was written for the hit
+
+    backend.set("c", 3)
+
+    assert backend.get("b") is None
+    assert backend.get("a") == 1 and backend.get("c") == 3
+
+
+def test_table_name_keeps_caches_apart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    summaries = SQLiteBackend(path)
+    ocr = SQLiteBackend(path, table="ocr_cache")
+    ocr.set("page", "text")
+    ocr.flush()
+
+    assert summaries.get("page") is None
+    assert ocr.get("page") == "text"
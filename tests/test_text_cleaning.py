@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from summary_utils.text_cleaning import clean_text, iter_clean_text
+
+_WORDS = [
+    "The", "study", "found", "results", "page", "Page", "of", "3", "12", "-", "- 4 -", "©", "2023",
+    "Copyright", "www.example.com", "https://example.org/a", "mail@example.com", "end.", "(see", "it)",
+    "naïve", "★", "→", "x2", "10", "of", "Figure", "–", "COPYRIGHT", "copyright", "©2020", "--",
+    "WWW.EXAMPLE.COM", "a.b",
+]
+_GAPS = [" ", " ", " ", "\n", "\n\n", " \n ", "\n \n", "\t", "\n\n\n", "  "]
+
+
+def _random_text(rng, words):
+    parts = []
+    for _ in range(words):
+        parts.append(rng.choice(_WORDS))
+        parts.append(rng.choice(_GAPS))
+    return "".join(parts)
+
+
+def _random_chunks(rng, text):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 12))))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.mark.parametrize("chunks", [
+    ["First page ends here.\n", "3\n", "Second page starts here."],
+    ["First page ends here.\n\n", "3\n\n", "Second page starts here."],
+    ["Some words\nPage 3 ", "of 10\nmore words"],
+    ["Intro text ", "Copyright 2023 Acme ", "all rights\nBody text."],
+    ["alpha\n", "\nbeta"],
+    ["", "only words here", ""],
+])
+def test_iter_clean_text_matches_clean_text(chunks):
+    assert "".join(iter_clean_text(chunks)) == clean_text("".join(chunks))
+
+
+def test_iter_clean_text_matches_clean_text_on_random_splits():
+    rng = random.Random(1234)
+    for _ in range(2000):
+        text = _random_text(rng, rng.randint(0, 60))
+        chunks = _random_chunks(rng, text)
+        assert "".join(iter_clean_text(chunks)) == clean_text(text), chunks
+
+
+def test_iter_clean_text_does_not_hold_back_the_whole_paragraph():
+    pages = [f"words of page number {'x' * (i + 1)} run on\n" for i in range(50)]
+    pieces = list(iter_clean_text(iter(pages)))
+    assert len(pieces) > 1
+    assert "".join(pieces) == clean_text("".join(pages))
+
+
+def test_copyright_notice_does_not_swallow_the_next_line():
+    assert clean_text("Intro.\n\nCopyright\nThe study found X.") == "Intro.\n\nThe study found X."
@@ -0,0 +1,141 @@
+import io
+import threading
+import time
+import wave
+
+import pytest
+
+from summary_utils.tts import (
+    AudioCache, SpeechSynthesizer, ToneEngine, audio_duration, get_engine, join_audio, split_for_speech,
+)
+
+TEXT = (
+    "Heading of the summary\n\n"
+    "The first sentence is short. The second sentence is a little longer than the first one. "
+    "A third sentence follows! Does a fourth one ask a question?\n"
+    "Point one\nPoint two"
+)
+
+
+class RecordingEngine(ToneEngine):
+    """ToneEngine that records each call and renders earlier segments more slowly."""
+
+    def __init__(self):
+        super().__init__(sample_rate=8000, word_seconds=0.01)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def synthesize(self, text, tld):
+        with self._lock:
+            self.calls.append(text)
+            delay = max(0.0, 0.05 - 0.01 * len(self.calls))
+        time.sleep(delay)
+        return super().synthesize(text, tld)
+
+
+def _frames(audio):
+    with wave.open(io.BytesIO(audio), "rb") as reader:
+        return reader.getnframes()
+
+
+def test_split_for_speech_keeps_the_first_segment_short():
+    segments = split_for_speech(TEXT, max_chars=80, first_max_chars=30)
+
+    assert segments[0] == "Heading of the summary"
+    assert all(len(segment) <= 80 for segment in segments)
+    assert " ".join(segments).split() == TEXT.split()
+
+
+def test_split_for_speech_gives_a_long_sentence_its_own_segment():
+    long_sentence = "word " * 40 + "end."
+    segments = split_for_speech(f"Short. {long_sentence} Tail.", max_chars=50, first_max_chars=10)
+
+    assert segments == ["Short.", long_sentence, "Tail."]
+
+
+def test_tone_engine_is_deterministic_and_follows_the_text():
+    engine = ToneEngine()
+
+    assert engine.synthesize("two words", "us") == engine.synthesize("two words", "us")
+    assert engine.synthesize("two words", "us") != engine.synthesize("two words", "co.in")
+    assert audio_duration(engine.synthesize("one two three four", "us"), "wav") == pytest.approx(0.2)
+
+
+def test_join_audio_writes_one_wav_header():
+    engine = ToneEngine()
+    parts = [engine.synthesize("a b", "us"), engine.synthesize("c", "us")]
+
+    joined = join_audio(parts, "wav")
+
+    assert _frames(joined) == _frames(parts[0]) + _frames(parts[1])
+    assert join_audio([b"ab", b"cd"], "mp3") == b"abcd"
+
+
+def test_audio_duration_reads_constant_bitrate_mp3():
+    # MPEG-2 layer III, 32 kbit/s frame header behind an ID3v2 tag
+    audio = b"ID3\x04\x00\x00\x00\x00\x00\x02ab" + b"\xff\xf3\x44\xc4" + b"\x00" * 3996
+    assert audio_duration(audio, "mp3") == pytest.approx(1.0)
+    assert audio_duration(b"not audio", "mp3") is None
+    assert audio_duration(b"not audio", "wav") is None
+
+
+def test_audio_cache_evicts_least_recently_used_by_bytes():
+    cache = AudioCache(max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"5678")
+    assert cache.get("a") == b"1234"  # "b" is now the oldest
+    cache.set("c", b"90ab")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    assert cache.stats()["bytes"] == 8
+    cache.set("huge", b"x" * 11)
+    assert cache.get("huge") is None
+
+
+def test_iter_segments_yields_in_order():
+    engine = RecordingEngine()
+    synthesizer = SpeechSynthesizer(engine, max_workers=4, segment_chars=40, first_segment_chars=20)
+    expected = [engine.synthesize(segment, "us") for segment in split_for_speech(TEXT, 40, 20)]
+    engine.calls.clear()
+
+    assert list(synthesizer.iter_segments(TEXT, "us")) == expected
+
+
+def test_synthesize_reports_the_first_segment_and_caches_the_track():
+    engine = RecordingEngine()
+    synthesizer = SpeechSynthesizer(engine, AudioCache(), max_workers=4, segment_chars=40, first_segment_chars=20)
+    first = []
+
+    track = synthesizer.synthesize(TEXT, "us", on_first_segment=first.append)
+
+    segments = split_for_speech(TEXT, 40, 20)
+    assert sorted(engine.calls) == sorted(segments)
+    assert first == [ToneEngine(word_seconds=0.01).synthesize(segments[0], "us")]
+    assert _frames(track) == sum(_frames(engine.synthesize(segment, "us")) for segment in segments)
+
+    engine.calls.clear()
+    first.clear()
+    assert synthesizer.synthesize(TEXT, "us", on_first_segment=first.append) == track
+    assert engine.calls == [] and first == []  # whole-track hit: no engine calls, no preview
+
+    # a different accent is a different track
+    synthesizer.synthesize(TEXT, "co.in")
+    assert len(engine.calls) == len(segments)
+
+
+def test_segments_are_shared_between_tracks():
+    engine = RecordingEngine()
+    synthesizer = SpeechSynthesizer(engine, AudioCache(), segment_chars=40, first_segment_chars=20)
+    synthesizer.synthesize("First sentence here. Second sentence here.", "us")
+    engine.calls.clear()
+
+    synthesizer.synthesize("First sentence here. Another ending.", "us")
+
+    assert engine.calls == ["Another ending."]
+
+
+def test_get_engine_rejects_unknown_names():
+    assert get_engine("tone").name == "tone"
+    with pytest.raises(ValueError):
+        get_engine("nope")
@@ -0,0 +1,38 @@
+import pytest
+
+from summary_utils import web_extraction
+from summary_utils.web_extraction import extract_main_text
+
+BACKENDS = [
+    pytest.param(web_extraction._events_lxml, marks=pytest.mark.skipif(
+        web_extraction.lxml_html is None, reason="lxml not installed"), id="lxml"),
+    pytest.param(web_extraction._events_lexbor, marks=pytest.mark.skipif(
+        web_extraction.HTMLParser is None, reason="selectolax not installed"), id="lexbor"),
+    pytest.param(web_extraction._events_bs4, id="bs4"),
+]
+
+PAGE = """<html><body>
+<nav><a href="/">Home</a> <a href="/about">About</a></nav>
+<div class="content">Lead paragraph of the story goes here.
+<p>Para two is a longer paragraph, with commas, and more words in it.</p>
+Closing remarks come after the paragraph, at the end.</div>
+<footer>Site footer</footer>
+</body></html>"""
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    monkeypatch.setattr(web_extraction, "_iter_events", request.param)
+
+
+def test_text_around_a_nested_block_keeps_document_order(backend):
+    assert extract_main_text(PAGE).split("\n\n") == [
+        "Lead paragraph of the story goes here.",
+        "Para two is a longer paragraph, with commas, and more words in it.",
+        "Closing remarks come after the paragraph, at the end.",
+    ]
+
+
+def test_nested_blocks_do_not_repeat_text(backend):
+    html = "<article><div><p>One sentence that is long enough to keep, with a comma.</p></div></article>"
+    assert extract_main_text(html) == "One sentence that is long enough to keep, with a comma."